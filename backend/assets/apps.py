@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AssetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assets'
+
+    def ready(self):
+        from hostel_inventory.conditional import track_versions
+        from hostel_inventory.events import track_events
+        from .serializers import AssetSerializer, DamageReportSerializer
+
+        track_versions(self.get_model('Asset'), self.get_model('DamageReport'))
+        track_events(self.get_model('Asset'), AssetSerializer, 'asset')
+        track_events(self.get_model('DamageReport'), DamageReportSerializer, 'damage_report')
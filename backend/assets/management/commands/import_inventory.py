@@ -0,0 +1,38 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from hostel_inventory.importer import AssetImporter, RoomImporter
+
+IMPORTERS = {
+    'rooms': RoomImporter,
+    'assets': AssetImporter,
+}
+
+
+class Command(BaseCommand):
+    help = 'Stream a rooms or assets CSV file into the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        importer = IMPORTERS[options['kind']](
+            batch_size=options['batch_size'],
+            progress=self.report_progress,
+        )
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as f:
+                summary = importer.run(f)
+        except (OSError, ValueError, csv.Error) as e:
+            raise CommandError(str(e))
+
+        for error in summary['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary['written']} of {summary['processed']} rows "
+            f"({summary['error_count']} rejected)"
+        ))
+
+    def report_progress(self, summary):
+        self.stdout.write(f"{summary['processed']} rows read, {summary['written']} written")
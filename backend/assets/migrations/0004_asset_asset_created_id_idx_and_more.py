@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0003_remove_damaged_quantity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['-created_at', '-id'], name='asset_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='damagereport',
+            index=models.Index(fields=['-reported_at', '-id'], name='damage_reported_id_idx'),
+        ),
+    ]
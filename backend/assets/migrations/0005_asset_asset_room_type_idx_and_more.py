@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0004_asset_asset_created_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['room', 'asset_type'], name='asset_room_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['asset_type', '-created_at'], name='asset_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['condition', '-created_at'], name='asset_condition_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='damagereport',
+            index=models.Index(fields=['room', 'status'], name='damage_room_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='damagereport',
+            index=models.Index(fields=['status', '-reported_at'], name='damage_status_reported_idx'),
+        ),
+    ]
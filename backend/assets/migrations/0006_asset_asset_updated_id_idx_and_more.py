@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0005_asset_asset_room_type_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['updated_at', 'id'], name='asset_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='damagereport',
+            index=models.Index(fields=['updated_at', 'id'], name='damage_updated_id_idx'),
+        ),
+    ]
@@ -38,6 +38,13 @@ class Asset(models.Model):
         verbose_name = "Asset"
         verbose_name_plural = "Assets"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='asset_created_id_idx'),
+            models.Index(fields=['room', 'asset_type'], name='asset_room_type_idx'),
+            models.Index(fields=['asset_type', '-created_at'], name='asset_type_created_idx'),
+            models.Index(fields=['condition', '-created_at'], name='asset_condition_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='asset_updated_id_idx'),
+        ]
 
 
 class DamageReport(models.Model):
@@ -75,3 +82,9 @@ class DamageReport(models.Model):
         verbose_name = "Damage Report"
         verbose_name_plural = "Damage Reports"
         ordering = ['-reported_at']
+        indexes = [
+            models.Index(fields=['-reported_at', '-id'], name='damage_reported_id_idx'),
+            models.Index(fields=['room', 'status'], name='damage_room_status_idx'),
+            models.Index(fields=['status', '-reported_at'], name='damage_status_reported_idx'),
+            models.Index(fields=['updated_at', 'id'], name='damage_updated_id_idx'),
+        ]
@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from hostel_inventory.bulk import PreloadedPrimaryKeyRelatedField
+from hostel_inventory.fields import SparseFieldsMixin
+from rooms.models import Room
 from .models import Asset, DamageReport
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    room = PreloadedPrimaryKeyRelatedField(queryset=Room.objects.all(), allow_null=True, required=False)
     room_display = serializers.CharField(source='room.room_number', read_only=True)
     
     class Meta:
@@ -14,7 +18,8 @@ class AssetSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
-class DamageReportSerializer(serializers.ModelSerializer):
+class DamageReportSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    room = PreloadedPrimaryKeyRelatedField(queryset=Room.objects.all())
     room_number = serializers.CharField(source='room.room_number', read_only=True)
     
     class Meta:
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+from hostel_inventory.conditional import get_versions, version_key
+from rooms.models import Room
+from .models import Asset
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.room = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        self.asset = Asset.objects.create(name='Bed 1', asset_type='Bed', room=self.room)
+
+    def etag(self):
+        response = self.client.get('/api/assets/assets/')
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.etag()
+        response = self.client.get('/api/assets/assets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag_after_commit(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/assets/assets/{self.asset.pk}/', {'condition': 'Damaged'}, format='json')
+        self.assertNotEqual(self.etag(), etag)
+
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/assets/assets/bulk/', [{'id': self.asset.pk, 'total_quantity': 2}], format='json')
+        self.assertNotEqual(self.etag(), etag)
+
+        etag = self.etag()
+        # Rooms are serialized into assets too
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/rooms/{self.room.pk}/', {'room_number': 'A2'}, format='json')
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_versions_do_not_expire(self):
+        with mock.patch.object(cache, 'add', wraps=cache.add) as add:
+            get_versions([Asset])
+        add.assert_called_once_with(version_key(Asset), mock.ANY, timeout=None)
+
+    def test_evicted_version_never_reuses_an_etag(self):
+        etag = self.etag()
+        cache.delete(version_key(Asset))
+        self.assertNotEqual(self.etag(), etag)
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        room = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        Asset.objects.bulk_create([Asset(name=f'Bed {i}', asset_type='Bed', room=room) for i in range(5)])
+
+    def test_wsgi_streams_a_sync_iterator(self):
+        response = self.client.get('/api/assets/assets/export/csv/')
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 6)
+
+    def test_asgi_streams_an_async_iterator(self):
+        @async_to_sync
+        async def export():
+            response = await AsyncClient().get('/api/assets/assets/export/ndjson/')
+            return response, [chunk async for chunk in response.streaming_content]
+
+        response, chunks = export()
+        self.assertTrue(response.is_async)
+        self.assertEqual(len(b''.join(chunks).decode().splitlines()), 5)
@@ -7,5 +7,6 @@ router.register(r'assets', views.AssetViewSet, basename='asset')
 router.register(r'damage-reports', views.DamageReportViewSet, basename='damage-report')
 
 urlpatterns = [
+    path('events/', views.events_view, name='asset-events'),
     path('', include(router.urls)),
 ]
@@ -1,16 +1,109 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
+from hostel_inventory.bulk import BulkModelMixin
+from hostel_inventory.conditional import ConditionalGetMixin
+from hostel_inventory.events import event_stream, hub
+from hostel_inventory.export import ExportMixin
+from hostel_inventory.fastread import FastReadMixin
+from hostel_inventory.fields import SparseFieldsFilter
+from hostel_inventory.filters import FieldFilterBackend
+from hostel_inventory.importer import AssetImporter, CsvImportMixin
+from hostel_inventory.pagination import KeysetPagination
+from hostel_inventory.renderers import LIST_RENDERERS
+from rooms.models import Room
+from sync.mixins import SyncMixin
 from .models import Asset, DamageReport
 from .serializers import AssetSerializer, DamageReportSerializer
 
 
-class AssetViewSet(viewsets.ModelViewSet):
-    queryset = Asset.objects.all()
+class AssetViewSet(ConditionalGetMixin, FastReadMixin, SyncMixin, BulkModelMixin, ExportMixin, CsvImportMixin, viewsets.ModelViewSet):
+    queryset = Asset.objects.select_related('room')
     serializer_class = AssetSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    renderer_classes = LIST_RENDERERS
+    filter_backends = [FieldFilterBackend, OrderingFilter, SparseFieldsFilter]
+    filter_fields = {
+        'asset_type': 'asset_type',
+        'condition': 'condition',
+        'room': 'room',
+        'room_number': 'room__room_number',
+        'hostel_name': 'room__hostel_name',
+        'floor': 'room__floor',
+    }
+    ordering_fields = ['created_at', 'name', 'asset_type', 'condition', 'total_quantity']
+    etag_models = [Asset, Room]
+    bulk_preload = {'room': Room}
+    importer_class = AssetImporter
+    export_filename = 'assets'
+    export_fields = [
+        ('id', 'id'),
+        ('name', 'name'),
+        ('asset_type', 'asset_type'),
+        ('total_quantity', 'total_quantity'),
+        ('condition', 'condition'),
+        ('room_number', 'room__room_number'),
+        ('hostel_name', 'room__hostel_name'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
 
 
-class DamageReportViewSet(viewsets.ModelViewSet):
-    queryset = DamageReport.objects.all()
+class DamageReportViewSet(ConditionalGetMixin, FastReadMixin, SyncMixin, BulkModelMixin, ExportMixin, viewsets.ModelViewSet):
+    queryset = DamageReport.objects.select_related('room')
     serializer_class = DamageReportSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    renderer_classes = LIST_RENDERERS
+    filter_backends = [FieldFilterBackend, OrderingFilter, SparseFieldsFilter]
+    filter_fields = {
+        'status': 'status',
+        'asset_type': 'asset_type',
+        'room': 'room',
+        'room_number': 'room__room_number',
+        'hostel_name': 'room__hostel_name',
+        'reported_after': 'reported_at__gte',
+        'reported_before': 'reported_at__lt',
+    }
+    ordering_fields = ['reported_at', 'updated_at', 'status', 'asset_type']
+    etag_models = [DamageReport, Room]
+    bulk_preload = {'room': Room}
+    export_filename = 'damage-reports'
+    export_fields = [
+        ('id', 'id'),
+        ('room_number', 'room__room_number'),
+        ('hostel_name', 'room__hostel_name'),
+        ('asset_type', 'asset_type'),
+        ('description', 'description'),
+        ('status', 'status'),
+        ('reported_at', 'reported_at'),
+        ('updated_at', 'updated_at'),
+    ]
+
+
+async def events_view(request):
+    """
+    Server-sent events for asset and damage report changes. Optional filters:
+    ``topics=asset,damage_report``, ``hostel_name`` and ``room`` (id).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live events are only served by the ASGI application'}, status=501)
+
+    topics = {topic for topic in request.GET.get('topics', '').split(',') if topic}
+    try:
+        room_id = int(request.GET['room']) if request.GET.get('room') else None
+    except ValueError:
+        return JsonResponse({'error': 'room must be an integer'}, status=400)
+
+    subscription = hub.subscribe(
+        topics=topics,
+        hostel_name=request.GET.get('hostel_name') or None,
+        room_id=room_id,
+    )
+    response = StreamingHttpResponse(event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
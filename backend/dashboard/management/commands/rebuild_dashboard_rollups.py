@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from dashboard.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard breakdown rollups from the asset and damage report tables'
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} rollup rows'))
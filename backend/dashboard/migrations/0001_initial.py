@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('asset', 'Asset'), ('damage', 'Damage Report')], max_length=10)),
+                ('hostel_name', models.CharField(blank=True, max_length=100)),
+                ('floor', models.IntegerField(blank=True, null=True)),
+                ('asset_type', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('reported_on', models.DateField(blank=True, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Rollup',
+                'verbose_name_plural': 'Dashboard Rollups',
+                'indexes': [models.Index(fields=['kind', 'hostel_name', 'floor', 'asset_type', 'status', 'reported_on'], name='rollup_key_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:40
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+NO_FLOOR = -2147483648
+NO_DAY = datetime.date(1970, 1, 1)
+KEY_FIELDS = ('kind', 'hostel_name', 'floor', 'asset_type', 'status', 'reported_on')
+
+
+def merge_duplicate_keys(apps, schema_editor):
+    DashboardRollup = apps.get_model('dashboard', 'DashboardRollup')
+    DashboardRollup.objects.filter(floor__isnull=True).update(floor=NO_FLOOR)
+    DashboardRollup.objects.filter(reported_on__isnull=True).update(reported_on=NO_DAY)
+    duplicates = (
+        DashboardRollup.objects.values(*KEY_FIELDS)
+        .annotate(rows=Count('id'), total=Sum('count'), total_quantity=Sum('quantity'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for row in duplicates:
+        lookup = {field: row[field] for field in KEY_FIELDS}
+        keep, *extra = DashboardRollup.objects.filter(**lookup).order_by('id').values_list('id', flat=True)
+        DashboardRollup.objects.filter(id__in=extra).delete()
+        DashboardRollup.objects.filter(id=keep).update(count=row['total'], quantity=row['total_quantity'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='dashboardrollup',
+            name='floor',
+            field=models.IntegerField(default=-2147483648),
+        ),
+        migrations.AlterField(
+            model_name='dashboardrollup',
+            name='reported_on',
+            field=models.DateField(default=datetime.date(1970, 1, 1)),
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardrollup',
+            constraint=models.UniqueConstraint(fields=('kind', 'hostel_name', 'floor', 'asset_type', 'status', 'reported_on'), name='rollup_key_unique'),
+        ),
+        # The constraint's index serves the key lookups now
+        migrations.RemoveIndex(
+            model_name='dashboardrollup',
+            name='rollup_key_idx',
+        ),
+    ]
@@ -0,0 +1,44 @@
+import datetime
+
+from django.db import models
+
+
+class DashboardRollup(models.Model):
+    """
+    Pre-aggregated asset and damage report counts for the dashboard breakdown.
+
+    Asset rows count assets per (hostel, floor, asset type, condition) and
+    damage rows count reports per (hostel, floor, asset type, status, day
+    reported). Rows without a room have an empty hostel name and no floor.
+
+    The key columns are unique, so they hold sentinels instead of NULL (which
+    never equals itself): ``NO_FLOOR`` for no floor and ``NO_DAY`` on asset rows.
+    """
+    KIND_CHOICES = [
+        ('asset', 'Asset'),
+        ('damage', 'Damage Report'),
+    ]
+    NO_FLOOR = -2147483648
+    NO_DAY = datetime.date(1970, 1, 1)
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    hostel_name = models.CharField(max_length=100, blank=True)
+    floor = models.IntegerField(default=NO_FLOOR)
+    asset_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    reported_on = models.DateField(default=NO_DAY)
+    count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.kind} {self.hostel_name}/{self.floor} {self.asset_type} {self.status}: {self.count}"
+
+    class Meta:
+        verbose_name = "Dashboard Rollup"
+        verbose_name_plural = "Dashboard Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'hostel_name', 'floor', 'asset_type', 'status', 'reported_on'],
+                name='rollup_key_unique',
+            ),
+        ]
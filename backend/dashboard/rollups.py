@@ -0,0 +1,250 @@
+"""
+Dashboard Rollups
+=================
+
+Keeps DashboardRollup in step with Asset and DamageReport. Single-row saves
+and deletes apply +1/-1 deltas in the same transaction as the write; bulk
+inserts, updates and deletes apply their deltas grouped; a bulk change that
+doesn't say which rows it touched rebuilds from scratch once its transaction
+commits.
+Open reports are rolled up per day so age buckets stay correct as time passes.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from .models import DashboardRollup
+
+KEY_FIELDS = ('kind', 'hostel_name', 'floor', 'asset_type', 'status', 'reported_on')
+
+NO_ROOM = ('', None)
+
+AGE_BUCKETS = [
+    ('0-7 days', 0, 7),
+    ('8-30 days', 8, 30),
+    ('31-90 days', 31, 90),
+    ('90+ days', 91, None),
+]
+
+
+def floor_key(floor):
+    return DashboardRollup.NO_FLOOR if floor is None else floor
+
+
+def asset_key(room_dims, asset_type, condition):
+    hostel_name, floor = room_dims
+    return ('asset', hostel_name or '', floor_key(floor), asset_type, condition, DashboardRollup.NO_DAY)
+
+
+def damage_key(room_dims, asset_type, status, reported_on):
+    hostel_name, floor = room_dims
+    return ('damage', hostel_name or '', floor_key(floor), asset_type, status, reported_on)
+
+
+def add_delta(deltas, key, count, quantity=0):
+    current_count, current_quantity = deltas.get(key, (0, 0))
+    deltas[key] = (current_count + count, current_quantity + quantity)
+
+
+def add_to_row(lookup, count, quantity):
+    return DashboardRollup.objects.filter(**lookup).update(
+        count=F('count') + count,
+        quantity=F('quantity') + quantity,
+    )
+
+
+def apply_deltas(deltas):
+    for key, (count, quantity) in deltas.items():
+        if not count and not quantity:
+            continue
+        lookup = dict(zip(KEY_FIELDS, key))
+        if add_to_row(lookup, count, quantity):
+            continue
+        try:
+            with transaction.atomic():
+                DashboardRollup.objects.create(count=count, quantity=quantity, **lookup)
+        except IntegrityError:
+            # Another transaction inserted the row since our UPDATE matched nothing
+            add_to_row(lookup, count, quantity)
+
+
+def room_dims(room_id):
+    if room_id is None:
+        return NO_ROOM
+    return Room.objects.filter(pk=room_id).values_list('hostel_name', 'floor').first() or NO_ROOM
+
+
+def instance_room_dims(instance):
+    """Use the already loaded room when there is one, else one small query."""
+    field = type(instance)._meta.get_field('room')
+    if field.is_cached(instance):
+        room = instance.room
+        return (room.hostel_name, room.floor) if room else NO_ROOM
+    return room_dims(instance.room_id)
+
+
+def reported_on(instance):
+    return timezone.localdate(instance.reported_at)
+
+
+def add_row(deltas, model, obj, dims, sign=1):
+    if model is Asset:
+        add_delta(deltas, asset_key(dims, obj.asset_type, obj.condition), sign, sign * obj.total_quantity)
+    else:
+        add_delta(deltas, damage_key(dims, obj.asset_type, obj.status, reported_on(obj)), sign)
+
+
+def bulk_room_dims(objs):
+    rooms = Room.objects.in_bulk({obj.room_id for obj in objs if obj.room_id})
+    return {room_id: (room.hostel_name, room.floor) for room_id, room in rooms.items()}
+
+
+def add_created(model, objs, sign=1):
+    """
+    Apply deltas for freshly bulk-inserted rows with one room query, or
+    with ``sign=-1`` for bulk-deleted ones.
+    """
+    dims = bulk_room_dims(objs)
+    deltas = {}
+    for obj in objs:
+        add_row(deltas, model, obj, dims.get(obj.room_id, NO_ROOM), sign)
+    apply_deltas(deltas)
+
+
+def add_updated(model, pairs):
+    """Apply deltas for bulk-updated ``(before, after)`` pairs."""
+    if model is Room:
+        for before, after in pairs:
+            old, new = (before.hostel_name, before.floor), (after.hostel_name, after.floor)
+            if old != new:
+                move_room(after.pk, old, new)
+        return
+    dims = bulk_room_dims([obj for pair in pairs for obj in pair])
+    deltas = {}
+    for before, after in pairs:
+        add_row(deltas, model, before, dims.get(before.room_id, NO_ROOM), -1)
+        add_row(deltas, model, after, dims.get(after.room_id, NO_ROOM))
+    apply_deltas(deltas)
+
+
+def move_room(room_id, old_dims, new_dims, include_reports=True):
+    """
+    Move a room's contributions when its hostel or floor changes. On delete
+    only the assets move (to no room); the reports are deleted with the room.
+    """
+    deltas = {}
+    assets = (
+        Asset.objects.filter(room_id=room_id)
+        .values('asset_type', 'condition')
+        .annotate(count=Count('id'), quantity=Sum('total_quantity'))
+        .order_by()
+    )
+    for row in assets:
+        add_delta(deltas, asset_key(old_dims, row['asset_type'], row['condition']), -row['count'], -row['quantity'])
+        add_delta(deltas, asset_key(new_dims, row['asset_type'], row['condition']), row['count'], row['quantity'])
+    if include_reports:
+        reports = (
+            DamageReport.objects.filter(room_id=room_id)
+            .annotate(reported_on=TruncDate('reported_at'))
+            .values('asset_type', 'status', 'reported_on')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        for row in reports:
+            add_delta(deltas, damage_key(old_dims, row['asset_type'], row['status'], row['reported_on']), -row['count'])
+            add_delta(deltas, damage_key(new_dims, row['asset_type'], row['status'], row['reported_on']), row['count'])
+    apply_deltas(deltas)
+
+
+def rebuild():
+    """Recompute every rollup row from the source tables."""
+    # Summed by key: no room and a room without hostel or floor share one
+    deltas = {}
+    assets = (
+        Asset.objects.values('room__hostel_name', 'room__floor', 'asset_type', 'condition')
+        .annotate(count=Count('id'), quantity=Sum('total_quantity'))
+        .order_by()
+    )
+    for row in assets:
+        key = asset_key((row['room__hostel_name'], row['room__floor']), row['asset_type'], row['condition'])
+        add_delta(deltas, key, row['count'], row['quantity'])
+    reports = (
+        DamageReport.objects.annotate(reported_on=TruncDate('reported_at'))
+        .values('room__hostel_name', 'room__floor', 'asset_type', 'status', 'reported_on')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in reports:
+        key = damage_key((row['room__hostel_name'], row['room__floor']), row['asset_type'], row['status'], row['reported_on'])
+        add_delta(deltas, key, row['count'])
+    rows = [
+        DashboardRollup(count=count, quantity=quantity, **dict(zip(KEY_FIELDS, key)))
+        for key, (count, quantity) in deltas.items()
+    ]
+
+    with transaction.atomic():
+        DashboardRollup.objects.all().delete()
+        DashboardRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def breakdown_querysets():
+    damage = (
+        DashboardRollup.objects.filter(kind='damage')
+        .values('hostel_name', 'floor')
+        .annotate(
+            total=Sum('count'),
+            open=Coalesce(Sum('count', filter=Q(status='Not Fixed')), 0),
+        )
+        .filter(total__gt=0)
+        .order_by('hostel_name', 'floor')
+    )
+    assets = (
+        DashboardRollup.objects.filter(kind='asset')
+        .values('asset_type', 'status')
+        .annotate(total=Sum('count'), total_quantity=Sum('quantity'))
+        .filter(total__gt=0)
+        .order_by('asset_type', 'status')
+    )
+    open_by_day = (
+        DashboardRollup.objects.filter(kind='damage', status='Not Fixed')
+        .values_list('reported_on')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    return damage, assets, open_by_day
+
+
+def build_breakdown(damage, assets, open_by_day):
+    today = timezone.localdate()
+    ages = {label: 0 for label, _, _ in AGE_BUCKETS}
+    for day, count in open_by_day:
+        age = (today - day).days
+        for label, low, high in AGE_BUCKETS:
+            if age >= low and (high is None or age <= high):
+                ages[label] += count
+                break
+
+    return {
+        'damage_by_hostel_floor': [
+            {**row, 'floor': None if row['floor'] == DashboardRollup.NO_FLOOR else row['floor']}
+            for row in damage
+        ],
+        'assets_by_type_condition': [
+            {'asset_type': row['asset_type'], 'condition': row['status'],
+             'count': row['total'], 'quantity': row['total_quantity']}
+            for row in assets
+        ],
+        'open_reports_by_age': ages,
+    }
+
+
+def get_breakdown():
+    return build_breakdown(*[list(queryset) for queryset in breakdown_querysets()])
+
+
+async def aget_breakdown():
+    return build_breakdown(*[[row async for row in queryset] for queryset in breakdown_querysets()])
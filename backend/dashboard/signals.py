@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from assets.models import Asset, DamageReport
+from hostel_inventory.signals import deleted_in_bulk, rows_changed, track_previous
+from rooms.models import Room
+from users.models import UserProfile
+from . import rollups
+from .summary import invalidate_summary
+
+COUNTED_MODELS = (Asset, DamageReport, Room, UserProfile)
+ROLLUP_MODELS = (Asset, DamageReport, Room)
+
+for model in ROLLUP_MODELS:
+    track_previous(model)
+
+
+def invalidate_on_commit():
+    transaction.on_commit(invalidate_summary)
+
+
+@receiver(post_save)
+def summary_row_saved(sender, created, **kwargs):
+    # Updates only change the counts when a damage report changes status
+    if sender in COUNTED_MODELS and (created or sender is DamageReport):
+        invalidate_on_commit()
+
+
+@receiver(post_delete)
+def summary_row_deleted(sender, **kwargs):
+    if sender in COUNTED_MODELS and not deleted_in_bulk(sender):
+        invalidate_on_commit()
+
+
+@receiver(rows_changed)
+def summary_rows_changed(sender, **kwargs):
+    if sender in COUNTED_MODELS:
+        invalidate_on_commit()
+
+
+def previous_room_dims(instance):
+    previous = getattr(instance, '_previous', None)
+    return rollups.instance_room_dims(previous) if previous else None
+
+
+@receiver(post_save, sender=Asset)
+def asset_rollup_saved(sender, instance, **kwargs):
+    deltas = {}
+    old_dims = previous_room_dims(instance)
+    if old_dims:
+        rollups.add_row(deltas, Asset, instance._previous, old_dims, -1)
+    rollups.add_row(deltas, Asset, instance, rollups.instance_room_dims(instance))
+    rollups.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Asset)
+def asset_rollup_deleted(sender, instance, **kwargs):
+    if deleted_in_bulk(sender):
+        return
+    deltas = {}
+    rollups.add_row(deltas, Asset, instance, rollups.instance_room_dims(instance), -1)
+    rollups.apply_deltas(deltas)
+
+
+@receiver(post_save, sender=DamageReport)
+def damage_rollup_saved(sender, instance, **kwargs):
+    deltas = {}
+    old_dims = previous_room_dims(instance)
+    if old_dims:
+        rollups.add_row(deltas, DamageReport, instance._previous, old_dims, -1)
+    rollups.add_row(deltas, DamageReport, instance, rollups.instance_room_dims(instance))
+    rollups.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=DamageReport)
+def damage_rollup_deleted(sender, instance, **kwargs):
+    if deleted_in_bulk(sender):
+        return
+    deltas = {}
+    rollups.add_row(deltas, DamageReport, instance, rollups.instance_room_dims(instance), -1)
+    rollups.apply_deltas(deltas)
+
+
+@receiver(post_save, sender=Room)
+def room_rollup_saved(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    new = (instance.hostel_name, instance.floor)
+    if previous and (previous.hostel_name, previous.floor) != new:
+        rollups.move_room(instance.pk, (previous.hostel_name, previous.floor), new)
+
+
+@receiver(pre_delete, sender=Room)
+def room_rollup_deleted(sender, instance, **kwargs):
+    # Assets are kept with room set to NULL; reports cascade and roll back themselves
+    rollups.move_room(instance.pk, (instance.hostel_name, instance.floor), rollups.NO_ROOM, include_reports=False)
+
+
+@receiver(rows_changed)
+def rollup_rows_changed(sender, created=None, updated=None, deleted=None, **kwargs):
+    if sender not in ROLLUP_MODELS:
+        return
+    if created is None and updated is None and deleted is None:
+        # Nothing says which rows changed: recount once, after the write is in
+        transaction.on_commit(rollups.rebuild)
+        return
+    # New rooms hold no assets or reports yet
+    if created and sender is not Room:
+        rollups.add_created(sender, created)
+    if updated:
+        rollups.add_updated(sender, updated)
+    # A deleted room's assets were already moved by room_rollup_deleted
+    if deleted and sender is not Room:
+        rollups.add_created(sender, deleted, sign=-1)
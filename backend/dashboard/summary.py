@@ -0,0 +1,82 @@
+"""
+Dashboard Summary Cache
+=======================
+
+The summary counts are cached under a generation number. Any change to the
+counted tables bumps the generation once the transaction commits, so a
+request that computed its counts from older data can only ever write to a
+key nobody reads anymore. A warm read costs two cache gets and no queries.
+The ``a``-prefixed functions are the same steps for async views.
+"""
+
+import time
+
+from django.core.cache import cache
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from users.models import UserProfile
+
+GENERATION_KEY = 'dashboard:summary:generation'
+SUMMARY_KEY = 'dashboard:summary:{}'
+# Only clears out summaries of old generations, which are never read again
+SUMMARY_TIMEOUT = 60
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # A fresh value, never a reused one, if the key was evicted
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def compute_summary():
+    return {
+        'total_assets': Asset.objects.count(),
+        'damage_reports': DamageReport.objects.filter(status='Not Fixed').count(),
+        'total_rooms': Room.objects.count(),
+        'total_users': UserProfile.objects.count(),
+    }
+
+
+def get_summary():
+    key = SUMMARY_KEY.format(get_generation())
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary()
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+async def aget_generation():
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+async def acompute_summary():
+    return {
+        'total_assets': await Asset.objects.acount(),
+        'damage_reports': await DamageReport.objects.filter(status='Not Fixed').acount(),
+        'total_rooms': await Room.objects.acount(),
+        'total_users': await UserProfile.objects.acount(),
+    }
+
+
+async def aget_summary():
+    key = SUMMARY_KEY.format(await aget_generation())
+    summary = await cache.aget(key)
+    if summary is None:
+        summary = await acompute_summary()
+        await cache.aset(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+def invalidate_summary():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from . import rollups
+from .summary import GENERATION_KEY
+from .models import DashboardRollup
+
+
+class RollupTests(TestCase):
+    """Incremental rollup updates must end where a full rebuild would."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.rooms = [
+            Room.objects.create(room_number='A1', hostel_name='North', floor=1),
+            Room.objects.create(room_number='B2', hostel_name='South', floor=2),
+        ]
+        self.asset = Asset.objects.create(name='Bed 1', asset_type='Bed', room=self.rooms[0])
+        self.report = DamageReport.objects.create(room=self.rooms[0], asset_type='Bed', description='Broken leg')
+
+    def assertMatchesRebuild(self):
+        incremental = rollups.get_breakdown()
+        rollups.rebuild()
+        self.assertEqual(incremental, rollups.get_breakdown())
+
+    def test_single_row_writes(self):
+        self.client.patch(f'/api/assets/assets/{self.asset.pk}/',
+                          {'condition': 'Damaged', 'room': self.rooms[1].pk, 'total_quantity': 3}, format='json')
+        self.client.patch(f'/api/assets/damage-reports/{self.report.pk}/', {'status': 'Fixed'}, format='json')
+        self.client.patch(f'/api/rooms/{self.rooms[0].pk}/', {'hostel_name': 'East'}, format='json')
+        self.assertMatchesRebuild()
+        self.client.delete(f'/api/assets/assets/{self.asset.pk}/')
+        self.client.delete(f'/api/rooms/{self.rooms[0].pk}/')
+        self.assertMatchesRebuild()
+
+    def test_bulk_update_applies_deltas(self):
+        other = Asset.objects.create(name='Fan 1', asset_type='Fan', room=self.rooms[1])
+        with mock.patch.object(rollups, 'rebuild') as rebuild:
+            response = self.client.patch('/api/assets/assets/bulk/', [
+                {'id': self.asset.pk, 'room': self.rooms[1].pk},
+                {'id': other.pk, 'condition': 'Damaged', 'total_quantity': 4},
+            ], format='json')
+        self.assertEqual(response.status_code, 200)
+        rebuild.assert_not_called()
+        self.assertMatchesRebuild()
+
+    def test_bulk_delete_applies_deltas(self):
+        other = Asset.objects.create(name='Fan 1', asset_type='Fan', room=self.rooms[1])
+        with mock.patch.object(rollups, 'rebuild') as rebuild:
+            response = self.client.delete('/api/assets/assets/bulk/', {'ids': [self.asset.pk, other.pk]},
+                                          format='json')
+        self.assertEqual(response.status_code, 200)
+        rebuild.assert_not_called()
+        self.assertMatchesRebuild()
+
+    def test_room_import_moves_contributions(self):
+        csv = b'room_number,hostel_name,floor\nA1,West,5\nC3,West,1\n'
+        with mock.patch.object(rollups, 'rebuild') as rebuild:
+            response = self.client.post('/api/rooms/import/', {'file': SimpleUploadedFile('rooms.csv', csv)})
+        self.assertEqual(response.status_code, 200, response.content)
+        rebuild.assert_not_called()
+        self.assertTrue(DashboardRollup.objects.filter(hostel_name='West', floor=5, count__gt=0).exists())
+        self.assertMatchesRebuild()
+
+    def test_insert_race_adds_to_the_other_row(self):
+        key = rollups.asset_key(rollups.NO_ROOM, 'Chair', 'Good')
+        DashboardRollup.objects.create(count=2, quantity=2, **dict(zip(rollups.KEY_FIELDS, key)))
+        add_to_row = rollups.add_to_row
+        calls = []
+
+        def racing(*args):
+            # The first UPDATE ran before another transaction inserted the row
+            calls.append(args)
+            return add_to_row(*args) if len(calls) > 1 else 0
+
+        with mock.patch.object(rollups, 'add_to_row', side_effect=racing):
+            rollups.apply_deltas({key: (1, 1)})
+        row = DashboardRollup.objects.get(kind='asset', asset_type='Chair')
+        self.assertEqual((row.count, row.quantity), (3, 3))
+
+    def test_roomless_rows_share_one_key(self):
+        Asset.objects.create(name='Chair 1', asset_type='Chair')
+        Asset.objects.create(name='Chair 2', asset_type='Chair')
+        self.assertEqual(DashboardRollup.objects.filter(asset_type='Chair').count(), 1)
+        self.assertMatchesRebuild()
+
+    def test_save_loads_previous_row_once(self):
+        asset = Asset.objects.select_related('room').get(pk=self.asset.pk)
+        asset.condition = 'Damaged'
+        with CaptureQueriesContext(connection) as queries:
+            asset.save()
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1, selects)
+
+
+class SummaryCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.room = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+
+    def total_assets(self):
+        return self.client.get('/api/dashboard/summary/').json()['total_assets']
+
+    def test_writes_invalidate_after_commit(self):
+        self.assertEqual(self.total_assets(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Asset.objects.create(name='Bed 1', asset_type='Bed', room=self.room)
+        self.assertEqual(self.total_assets(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            APIClient().post('/api/assets/assets/bulk/', [
+                {'name': 'Fan 1', 'asset_type': 'Fan', 'room': self.room.pk},
+                {'name': 'Fan 2', 'asset_type': 'Fan', 'room': self.room.pk},
+            ], format='json')
+        self.assertEqual(self.total_assets(), 3)
+
+    def test_cached_until_the_generation_changes(self):
+        self.assertEqual(self.total_assets(), 0)
+        # Written without signals, so nothing bumps the generation
+        Asset.objects.bulk_create([Asset(name='Bed 1', asset_type='Bed', room=self.room)])
+        self.assertEqual(self.total_assets(), 0)
+        cache.delete(GENERATION_KEY)
+        self.assertEqual(self.total_assets(), 1)
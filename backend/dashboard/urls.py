@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('summary/', views.dashboard_summary_view, name='dashboard-summary'),
+    path('breakdown/', views.dashboard_breakdown_view, name='dashboard-breakdown'),
 ]
@@ -1,22 +1,14 @@
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from assets.models import Asset, DamageReport
-from rooms.models import Room
-from users.models import UserProfile
+from django.http import JsonResponse
+from hostel_inventory.asyncviews import async_api_view
+from .rollups import aget_breakdown
+from .summary import aget_summary
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def dashboard_summary_view(request):
-    total_assets = Asset.objects.count()
-    damage_reports = DamageReport.objects.filter(status='Not Fixed').count()
-    total_rooms = Room.objects.count()
-    total_users = UserProfile.objects.count()
-    
-    return Response({
-        'total_assets': total_assets,
-        'damage_reports': damage_reports,
-        'total_rooms': total_rooms,
-        'total_users': total_users
-    })
+@async_api_view(['GET'])
+async def dashboard_summary_view(request):
+    return JsonResponse(await aget_summary())
+
+
+@async_api_view(['GET'])
+async def dashboard_breakdown_view(request):
+    return JsonResponse(await aget_breakdown())
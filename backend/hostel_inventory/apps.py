@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HostelInventoryConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'hostel_inventory'
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -2,6 +2,9 @@
 ASGI config for hostel_inventory project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn hostel_inventory.asgi:application``) to enable the
+live event stream at /api/assets/events/ and to let the async dashboard and
+user read views wait on the database without holding a thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
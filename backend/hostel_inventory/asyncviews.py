@@ -0,0 +1,45 @@
+"""
+Async Views
+===========
+
+DRF 3.14 cannot run ``async def`` views, so the read-only endpoints that
+benefit from it are plain Django async views. Under ASGI they wait on the
+database without holding a worker thread; under WSGI Django runs them
+through ``async_to_sync`` and they behave like any other view.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+
+
+def async_api_view(methods):
+    """
+    Method check for an async view, answering like ``@api_view`` does:
+    405 with DRF's error body for anything not listed, and an ``Allow``
+    header on OPTIONS.
+    """
+    allowed = [method.upper() for method in methods]
+    if 'GET' in allowed and 'HEAD' not in allowed:
+        allowed.append('HEAD')
+    allow_header = ', '.join(allowed + ['OPTIONS'])
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method == 'OPTIONS':
+                response = HttpResponse()
+            elif request.method not in allowed:
+                response = JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            else:
+                return await view(request, *args, **kwargs)
+            response['Allow'] = allow_header
+            return response
+        return wrapper
+    return decorator
+
+
+async def session_get(request, key, default=None):
+    """The session loads from the database on first access, so it has to run in a thread."""
+    return await sync_to_async(request.session.get)(key, default)
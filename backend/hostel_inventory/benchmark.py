@@ -0,0 +1,393 @@
+"""
+Endpoint Benchmarks
+===================
+
+Drives every route in ``hostel_inventory/urls.py`` concurrently through the
+WSGI and ASGI applications with an in-process httpx client, and reports
+latency percentiles, throughput, SQL queries and response sizes per
+endpoint. ``run_benchmarks`` seeds the dataset and saves the results as JSON.
+
+Scenarios are keyed by URL name and method. A call that uses up a row (a
+delete, a reset code) gets its own spare row, created before the clock
+starts, so every call does the same work.
+"""
+
+import asyncio
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.cookiejar import DefaultCookiePolicy
+
+from django.contrib.auth.hashers import make_password
+from django.urls import get_resolver
+from django.utils import timezone
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from users.models import UserProfile
+from . import querycount
+from .seed import SEED_PASSWORD
+from .signals import rows_changed
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Routes with no meaningful request/response timing
+EXCLUDED = {
+    'api-root': 'DRF router index',
+    'asset-events': 'long-lived server-sent event stream',
+}
+
+RESET_CODE = '123456'
+
+
+class Scenario:
+    """
+    One endpoint and method. ``path`` is formatted with the run context plus
+    the call's ``n`` and whatever ``prepare(ctx, count)`` returned for it
+    (spare rows, made before timing starts); ``json``/``files`` are callables
+    taking the same dict.
+    """
+
+    def __init__(self, url_name, method, path, json=None, files=None, prepare=None, auth=True, expect=200,
+                 hashes=False):
+        self.url_name = url_name
+        self.method = method
+        self.path = path
+        self.json = json
+        self.files = files
+        self.prepare = prepare
+        self.auth = auth
+        self.expect = expect
+        # Hashes a password per call, so runs fewer calls
+        self.hashes = hashes
+
+    @property
+    def label(self):
+        return f'{self.method} {self.url_name}'
+
+    def build(self, ctx, count):
+        extras = self.prepare(ctx, count) if self.prepare else [{}] * count
+        values = {**ctx}
+        # A fresh tag per build keeps generated usernames and room numbers unique
+        ctx['tag'] += 1
+        calls = []
+        for n, extra in enumerate(extras):
+            values.update(extra, n=n)
+            kwargs = {}
+            if self.json:
+                kwargs['json'] = self.json(values)
+            if self.files:
+                kwargs['files'] = self.files(values)
+            if self.auth:
+                kwargs['headers'] = {'Cookie': f'sessionid={ctx["session"]}'}
+            calls.append((self.method, self.path.format(**values), kwargs))
+        return calls
+
+
+def spare_rows(model, objs):
+    created = model.objects.bulk_create(objs)
+    rows_changed.send(sender=model, created=created)
+    return [{'target': obj.pk} for obj in created]
+
+
+def spare_rooms(ctx, count):
+    return spare_rows(Room, [
+        Room(room_number=f'spare-{ctx["tag"]}-{i}', hostel_name='Spare Hostel')
+        for i in range(count)
+    ])
+
+
+def spare_assets(ctx, count):
+    return spare_rows(Asset, [
+        Asset(name=f'Spare asset {i}', asset_type='Chair', room_id=ctx['room_id'])
+        for i in range(count)
+    ])
+
+
+def spare_reports(ctx, count):
+    return spare_rows(DamageReport, [
+        DamageReport(room_id=ctx['room_id'], asset_type='Chair', description=f'Spare report {i}')
+        for i in range(count)
+    ])
+
+
+def spare_users(ctx, count, reset_code=False):
+    expires = timezone.now() + timedelta(hours=1) if reset_code else None
+    emails = [f'spare-{ctx["tag"]}-{i}@example.com' for i in range(count)]
+    rows = spare_rows(UserProfile, [
+        UserProfile(
+            username=f'spare-{ctx["tag"]}-{i}',
+            email=email,
+            password=ctx['password_hash'],
+            reset_code=RESET_CODE if reset_code else None,
+            reset_code_expires=expires,
+        )
+        for i, email in enumerate(emails)
+    ])
+    return [{**row, 'email': email} for row, email in zip(rows, emails)]
+
+
+def spare_batches(make, size):
+    def prepare(ctx, count):
+        rows = make(ctx, count * size)
+        return [{'targets': [row['target'] for row in rows[i * size:(i + 1) * size]]}
+                for i in range(count)]
+    return prepare
+
+
+def csv_file(name, header, rows):
+    return {'file': (name, (header + '\n' + '\n'.join(rows) + '\n').encode(), 'text/csv')}
+
+
+ASSETS = '/api/assets/assets/'
+REPORTS = '/api/assets/damage-reports/'
+ROOMS = '/api/rooms/'
+USERS = '/api/users/'
+
+# Reads first, then writes, so every read sees the seeded dataset
+SCENARIOS = [
+    Scenario('health', 'GET', '/api/health/', auth=False),
+    Scenario('metrics', 'GET', '/api/metrics/', auth=False),
+    Scenario('dashboard-summary', 'GET', '/api/dashboard/summary/'),
+    Scenario('dashboard-breakdown', 'GET', '/api/dashboard/breakdown/'),
+    Scenario('room-list', 'GET', ROOMS),
+    Scenario('room-detail', 'GET', ROOMS + '{room_id}/'),
+    Scenario('room-sync', 'GET', ROOMS + 'sync/'),
+    Scenario('asset-list', 'GET', ASSETS),
+    Scenario('asset-detail', 'GET', ASSETS + '{asset_id}/'),
+    Scenario('asset-export', 'GET', ASSETS + 'export/csv/'),
+    Scenario('asset-sync', 'GET', ASSETS + 'sync/'),
+    Scenario('damage-report-list', 'GET', REPORTS),
+    Scenario('damage-report-detail', 'GET', REPORTS + '{report_id}/'),
+    Scenario('damage-report-export', 'GET', REPORTS + 'export/ndjson/'),
+    Scenario('damage-report-sync', 'GET', REPORTS + 'sync/'),
+    Scenario('current-user', 'GET', USERS + 'me/'),
+    Scenario('list-users', 'GET', USERS + 'list/'),
+    Scenario('user-directory-list', 'GET', USERS + 'directory/'),
+    Scenario('user-directory-detail', 'GET', USERS + 'directory/{user_id}/'),
+
+    Scenario('room-list', 'POST', ROOMS, expect=201,
+             json=lambda v: {'room_number': f'bench-{v["tag"]}-{v["n"]}', 'hostel_name': 'Bench Hostel', 'floor': 1}),
+    Scenario('room-detail', 'PATCH', ROOMS + '{room_id}/', json=lambda v: {'capacity': 2 + v['n'] % 3}),
+    Scenario('room-detail', 'DELETE', ROOMS + '{target}/', prepare=spare_rooms, expect=204),
+    Scenario('room-import-csv', 'POST', ROOMS + 'import/',
+             files=lambda v: csv_file('rooms.csv', 'room_number,hostel_name,floor,capacity', [
+                 f'csv-{v["tag"]}-{v["n"]}-{i},Bench Hostel,{i % 5},2' for i in range(10)
+             ])),
+    Scenario('asset-list', 'POST', ASSETS, expect=201,
+             json=lambda v: {'name': f'Bench asset {v["n"]}', 'asset_type': 'Chair', 'room': v['room_id']}),
+    Scenario('asset-detail', 'PATCH', ASSETS + '{asset_id}/', json=lambda v: {'total_quantity': 1 + v['n'] % 3}),
+    Scenario('asset-detail', 'DELETE', ASSETS + '{target}/', prepare=spare_assets, expect=204),
+    Scenario('asset-bulk', 'POST', ASSETS + 'bulk/', expect=201, json=lambda v: [
+        {'name': f'Bulk asset {v["n"]}-{i}', 'asset_type': 'Table', 'room': v['room_id']} for i in range(10)
+    ]),
+    Scenario('asset-bulk', 'PATCH', ASSETS + 'bulk/', prepare=spare_batches(spare_assets, 10),
+             json=lambda v: [{'id': pk, 'condition': 'Damaged'} for pk in v['targets']]),
+    Scenario('asset-bulk', 'DELETE', ASSETS + 'bulk/', prepare=spare_batches(spare_assets, 10),
+             json=lambda v: {'ids': v['targets']}),
+    Scenario('asset-import-csv', 'POST', ASSETS + 'import/',
+             files=lambda v: csv_file('assets.csv', 'name,asset_type,total_quantity,condition,room_number', [
+                 f'CSV asset {v["n"]}-{i},Chair,1,Good,{v["room_number"]}' for i in range(10)
+             ])),
+    Scenario('damage-report-list', 'POST', REPORTS, expect=201,
+             json=lambda v: {'room': v['room_id'], 'asset_type': 'Chair', 'description': f'Bench damage {v["n"]}'}),
+    Scenario('damage-report-detail', 'PATCH', REPORTS + '{report_id}/', json=lambda v: {'status': 'Fixed'}),
+    Scenario('damage-report-detail', 'DELETE', REPORTS + '{target}/', prepare=spare_reports, expect=204),
+    Scenario('damage-report-bulk', 'POST', REPORTS + 'bulk/', expect=201, json=lambda v: [
+        {'room': v['room_id'], 'asset_type': 'Table', 'description': f'Bulk damage {v["n"]}-{i}'} for i in range(10)
+    ]),
+    Scenario('damage-report-bulk', 'PATCH', REPORTS + 'bulk/', prepare=spare_batches(spare_reports, 10),
+             json=lambda v: [{'id': pk, 'status': 'Fixed'} for pk in v['targets']]),
+    Scenario('damage-report-bulk', 'DELETE', REPORTS + 'bulk/', prepare=spare_batches(spare_reports, 10),
+             json=lambda v: {'ids': v['targets']}),
+
+    Scenario('update-profile', 'PUT', USERS + 'profile/update/', json=lambda v: {'first_name': f'Bench{v["n"]}'}),
+    Scenario('update-user', 'PUT', USERS + 'update-user/{user_id}/', json=lambda v: {'last_name': f'Bench{v["n"]}'}),
+    Scenario('delete-user', 'DELETE', USERS + 'delete-user/{target}/', prepare=spare_users),
+    Scenario('request-reset', 'POST', USERS + 'request-reset/', auth=False, prepare=spare_users,
+             json=lambda v: {'email': v['email']}),
+    Scenario('verify-code', 'POST', USERS + 'verify-code/', auth=False,
+             prepare=lambda ctx, count: spare_users(ctx, count, reset_code=True),
+             json=lambda v: {'email': v['email'], 'code': RESET_CODE}),
+    Scenario('login', 'POST', USERS + 'login/', hashes=True, auth=False,
+             json=lambda v: {'username': v['warden_username'], 'password': SEED_PASSWORD}),
+    Scenario('logout', 'POST', USERS + 'logout/', auth=False),
+    Scenario('register', 'POST', USERS + 'register/', hashes=True, auth=False, expect=201,
+             json=lambda v: {'username': f'register-{v["tag"]}-{v["n"]}', 'password': 'bench-password',
+                             'email': f'register-{v["tag"]}-{v["n"]}@example.com'}),
+    Scenario('create-user', 'POST', USERS + 'create-user/', hashes=True, expect=201,
+             json=lambda v: {'username': f'created-{v["tag"]}-{v["n"]}', 'password': 'bench-password',
+                             'email': f'created-{v["tag"]}-{v["n"]}@example.com'}),
+    Scenario('bulk-create-users', 'POST', USERS + 'bulk-create-users/', hashes=True, expect=201,
+             json=lambda v: {'users': [
+                 {'username': f'bulk-{v["tag"]}-{v["n"]}-{i}', 'password': 'bench-password',
+                  'email': f'bulk-{v["tag"]}-{v["n"]}-{i}@example.com'} for i in range(5)
+             ]}),
+    Scenario('reset-password-with-code', 'POST', USERS + 'reset-password-with-code/', hashes=True, auth=False,
+             prepare=lambda ctx, count: spare_users(ctx, count, reset_code=True),
+             json=lambda v: {'email': v['email'], 'code': RESET_CODE, 'new_password': 'bench-password'}),
+]
+
+
+def uncovered_routes():
+    """URL names in the project that neither a scenario nor EXCLUDED accounts for."""
+    names = {key for key in get_resolver().reverse_dict if isinstance(key, str)}
+    covered = {scenario.url_name for scenario in SCENARIOS} | set(EXCLUDED)
+    return sorted(names - covered)
+
+
+def percentile(values, q):
+    # Nearest-rank on sorted values
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(scenario, samples, wall):
+    latencies = sorted(sample[0] for sample in samples)
+    statuses = Counter(sample[1] for sample in samples)
+    count = len(samples)
+    return {
+        'url_name': scenario.url_name,
+        'method': scenario.method,
+        'requests': count,
+        'errors': count - statuses.get(scenario.expect, 0),
+        'status_codes': {str(code): seen for code, seen in sorted(statuses.items())},
+        'throughput_rps': round(count / wall, 1) if wall else None,
+        'latency_ms': {
+            'mean': round(sum(latencies) / count * 1000, 2),
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(latencies[-1] * 1000, 2),
+        },
+        'queries': {
+            'mean': round(sum(sample[2] for sample in samples) / count, 1),
+            'max': max(sample[2] for sample in samples),
+            'mean_ms': round(sum(sample[3] for sample in samples) / count * 1000, 2),
+        },
+        'response_bytes': round(sum(sample[4] for sample in samples) / count),
+    }
+
+
+def cookieless(client):
+    # Every call states its own session; none may leak in from an earlier response
+    client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return client
+
+
+def sample(response, started, counter):
+    return (time.perf_counter() - started, response.status_code, counter.count, counter.duration,
+            len(response.content))
+
+
+class WSGIRunner:
+    name = 'wsgi'
+
+    def __init__(self, concurrency):
+        from .wsgi import application
+        self.client = cookieless(httpx.Client(transport=httpx.WSGITransport(app=application),
+                                              base_url='http://testserver'))
+        self.concurrency = concurrency
+
+    def call(self, call):
+        method, path, kwargs = call
+        with querycount.counting_queries() as counter:
+            started = time.perf_counter()
+            response = self.client.request(method, path, **kwargs)
+            return sample(response, started, counter)
+
+    def login(self, ctx):
+        return self.client.post('/api/users/login/', json={
+            'username': ctx['warden_username'], 'password': SEED_PASSWORD,
+        }).cookies.get('sessionid')
+
+    def run(self, calls):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            started = time.perf_counter()
+            samples = list(executor.map(self.call, calls))
+        return samples, time.perf_counter() - started
+
+    def close(self):
+        self.client.close()
+
+
+class ASGIRunner:
+    name = 'asgi'
+
+    def __init__(self, concurrency):
+        from .asgi import application
+        self.application = application
+        self.concurrency = concurrency
+
+    async def call(self, client, slots, call):
+        method, path, kwargs = call
+        async with slots:
+            with querycount.counting_queries() as counter:
+                started = time.perf_counter()
+                response = await client.request(method, path, **kwargs)
+                return sample(response, started, counter)
+
+    async def gather(self, calls):
+        slots = asyncio.Semaphore(self.concurrency)
+        async with self.client() as client:
+            started = time.perf_counter()
+            samples = await asyncio.gather(*(self.call(client, slots, call) for call in calls))
+        return list(samples), time.perf_counter() - started
+
+    async def alogin(self, ctx):
+        async with self.client() as client:
+            response = await client.post('/api/users/login/', json={
+                'username': ctx['warden_username'], 'password': SEED_PASSWORD,
+            })
+        return response.cookies.get('sessionid')
+
+    def client(self):
+        return cookieless(httpx.AsyncClient(transport=httpx.ASGITransport(app=self.application),
+                                            base_url='http://testserver'))
+
+    def login(self, ctx):
+        return asyncio.run(self.alogin(ctx))
+
+    def run(self, calls):
+        return asyncio.run(self.gather(calls))
+
+    def close(self):
+        pass
+
+
+RUNNERS = {'wsgi': WSGIRunner, 'asgi': ASGIRunner}
+
+
+def run_benchmarks(ids, requests=50, password_requests=10, concurrency=8, apps=('wsgi', 'asgi'), only=None,
+                   progress=None):
+    """
+    Run every scenario (or those whose URL name is in ``only``) against each
+    app in ``apps``; scenarios that hash a password make ``password_requests``
+    calls instead of ``requests``. ``ids`` is what ``seed_dataset(users=...)``
+    returned. Returns ``{app: {label: stats}}``.
+    """
+    querycount.install()
+    room = Room.objects.values('room_number').get(pk=ids['room_id'])
+    ctx = {**ids, 'room_number': room['room_number'], 'tag': 0, 'password_hash': make_password(SEED_PASSWORD)}
+    scenarios = [scenario for scenario in SCENARIOS if not only or scenario.url_name in only]
+
+    results = {}
+    for app in apps:
+        runner = RUNNERS[app](concurrency)
+        try:
+            ctx['session'] = runner.login(ctx)
+            if not ctx['session']:
+                raise RuntimeError(f'Could not log in as {ctx["warden_username"]} through {app}')
+            results[app] = {}
+            for scenario in scenarios:
+                calls = scenario.build(ctx, password_requests if scenario.hashes else requests)
+                samples, wall = runner.run(calls)
+                results[app][scenario.label] = stats = summarize(scenario, samples, wall)
+                if progress:
+                    progress(app, scenario, stats)
+        finally:
+            runner.close()
+    return results
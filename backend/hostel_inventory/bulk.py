@@ -0,0 +1,209 @@
+"""
+Bulk Endpoints
+==============
+
+Viewset mixin adding ``bulk/`` create, update and delete for arrays of items.
+Items are validated and written in chunks inside one transaction, related
+rows are resolved with one query per relation, and errors are reported per
+item. If any item fails nothing is written.
+"""
+
+import copy
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .signals import deleting_in_bulk, rows_changed
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Looks the pk up in ``context['preloaded'][field_name]`` when a bulk
+    request has already fetched the related rows, instead of one query per item.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = preloaded.get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class BulkModelMixin:
+    """
+    Adds ``POST``/``PATCH``/``DELETE`` on ``<prefix>/bulk/``.
+
+    - POST takes a list of new items.
+    - PATCH takes a list of partial items, each with its ``id``.
+    - DELETE takes ``{"ids": [...]}``.
+
+    ``bulk_preload`` maps a related field name to its model so referenced
+    rows are fetched in one ``in_bulk`` query.
+    """
+    bulk_chunk_size = 500
+    bulk_max_items = 10000
+    bulk_preload = {}
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'DELETE':
+            return self.bulk_delete(request)
+
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of items'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.bulk_max_items:
+            return Response({'error': f'At most {self.bulk_max_items} items per request'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not all(isinstance(item, dict) for item in items):
+            return Response({'error': 'Every item must be an object'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if request.method == 'PATCH':
+            return self.bulk_update(items)
+        return self.bulk_create(items)
+
+    def get_bulk_context(self, items):
+        context = self.get_serializer_context()
+        preloaded = {}
+        for field_name, model in self.bulk_preload.items():
+            pks = set()
+            for item in items:
+                try:
+                    pks.add(int(item[field_name]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            preloaded[field_name] = model.objects.in_bulk(pks) if pks else {}
+        context['preloaded'] = preloaded
+        return context
+
+    def get_bulk_validator(self, items, partial=False):
+        # One bound serializer validates every item; building a fresh
+        # serializer (and its fields) per item dominates bulk request time
+        serializer_class = self.get_serializer_class()
+        return serializer_class(context=self.get_bulk_context(items), partial=partial)
+
+    def validate_bulk_item(self, validator, item):
+        try:
+            return validator.run_validation(item), None
+        except ValidationError as exc:
+            return None, serializers.as_serializer_error(exc)
+
+    def bulk_create(self, items):
+        validator = self.get_bulk_validator(items)
+        model = validator.Meta.model
+        errors = []
+        created = []
+
+        with transaction.atomic():
+            for start in range(0, len(items), self.bulk_chunk_size):
+                objs = []
+                for index, item in enumerate(items[start:start + self.bulk_chunk_size], start):
+                    data, item_errors = self.validate_bulk_item(validator, item)
+                    if item_errors:
+                        errors.append({'index': index, 'errors': item_errors})
+                    else:
+                        objs.append(model(**data))
+                if not errors:
+                    created.extend(model.objects.bulk_create(objs))
+            if errors:
+                transaction.set_rollback(True)
+            else:
+                rows_changed.send(sender=model, created=created)
+
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'created': len(created)}, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        validator = self.get_bulk_validator(items, partial=True)
+        model = validator.Meta.model
+        errors = []
+        updated = 0
+        changes = []
+
+        ids = set()
+        for item in items:
+            try:
+                ids.add(int(item.get('id')))
+            except (TypeError, ValueError):
+                continue
+
+        with transaction.atomic():
+            instances = self.get_queryset().select_for_update().in_bulk(ids)
+            now = timezone.now()
+            for start in range(0, len(items), self.bulk_chunk_size):
+                objs = []
+                fields = set()
+                for index, item in enumerate(items[start:start + self.bulk_chunk_size], start):
+                    try:
+                        instance = instances.get(int(item.get('id')))
+                    except (TypeError, ValueError):
+                        instance = None
+                    if instance is None:
+                        errors.append({'index': index, 'errors': {'id': ['Not found']}})
+                        continue
+                    data, item_errors = self.validate_bulk_item(validator, item)
+                    if item_errors:
+                        errors.append({'index': index, 'errors': item_errors})
+                        continue
+                    previous = copy.copy(instance)
+                    for field_name, value in data.items():
+                        setattr(instance, field_name, value)
+                        fields.add(field_name)
+                    instance.updated_at = now
+                    objs.append(instance)
+                    changes.append((previous, instance))
+                if not errors and objs:
+                    model.objects.bulk_update(objs, sorted(fields | {'updated_at'}))
+                    updated += len(objs)
+            if errors:
+                transaction.set_rollback(True)
+            else:
+                rows_changed.send(sender=model, updated=changes)
+
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+    def bulk_delete(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'Expected {"ids": [...]}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.bulk_max_items:
+            return Response({'error': f'At most {self.bulk_max_items} items per request'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'Ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_serializer_class().Meta.model
+        with transaction.atomic():
+            # Loaded up front so receivers get the rows (and their room_id) in one send
+            rows = model.objects.in_bulk(ids)
+            missing = [pk for pk in ids if pk not in rows]
+            if missing:
+                return Response({'errors': [{'id': pk, 'errors': ['Not found']} for pk in missing]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            existing = sorted(rows)
+            with deleting_in_bulk(model):
+                for start in range(0, len(existing), self.bulk_chunk_size):
+                    model.objects.filter(id__in=existing[start:start + self.bulk_chunk_size]).delete()
+            rows_changed.send(sender=model, deleted=[rows[pk] for pk in existing])
+
+        return Response({'deleted': len(existing)}, status=status.HTTP_200_OK)
@@ -0,0 +1,24 @@
+"""
+Deployment checks, run by ``manage.py check --deploy``.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PER_PROCESS_CACHES:
+        return [Error(
+            'The default cache is not shared between worker processes, so they '
+            'never see each other\'s ETag, summary, role and session invalidations.',
+            hint='Use RedisCache or PyMemcacheCache (see CACHES in hostel_inventory/settings.py).',
+            id='hostel_inventory.E001',
+        )]
+    return []
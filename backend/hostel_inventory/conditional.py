@@ -0,0 +1,99 @@
+"""
+Conditional GET
+===============
+
+Per-model version counters kept in the cache and bumped when a row is saved
+or deleted (after the transaction commits). A list or detail ETag is derived
+from the versions of every model its response reads, so ``If-None-Match``
+can be answered with 304 before any query or serialization runs.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+from .signals import deleted_in_bulk, rows_changed
+
+VERSION_KEY = 'model-version:{}'
+
+
+def version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def get_versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never reuse an old number after eviction or a restart
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def track_versions(*models):
+    """Bump each model's version whenever one of its rows changes."""
+    for model in models:
+        def changed(sender, **kwargs):
+            transaction.on_commit(lambda: bump_version(sender))
+
+        def deleted(sender, **kwargs):
+            if not deleted_in_bulk(sender):
+                changed(sender)
+
+        uid = f'track-versions-{model._meta.label_lower}'
+        post_save.connect(changed, sender=model, weak=False, dispatch_uid=f'{uid}-save')
+        post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'{uid}-delete')
+        rows_changed.connect(changed, sender=model, weak=False, dispatch_uid=f'{uid}-bulk')
+
+
+def matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag/If-None-Match handling to ``list`` and ``retrieve``.
+    ``etag_models`` lists every model the serialized response depends on.
+    """
+    etag_models = []
+
+    def get_etag(self, request):
+        versions = get_versions(self.etag_models)
+        media_type = getattr(request, 'accepted_media_type', '')
+        source = f'{versions}|{request.get_full_path()}|{media_type}'
+        return '"{}"'.format(hashlib.md5(source.encode()).hexdigest())
+
+    def conditional_response(self, request, render):
+        etag = self.get_etag(request)
+        if matches(request.META.get('HTTP_IF_NONE_MATCH'), etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = render()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept', 'Cookie'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
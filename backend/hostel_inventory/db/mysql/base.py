@@ -0,0 +1,10 @@
+"""MySQL (PyMySQL) backend drawing its connections from hostel_inventory.dbpool."""
+
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+from hostel_inventory.dbpool import PooledDatabaseMixin
+
+
+class DatabaseWrapper(PooledDatabaseMixin, MySQLDatabaseWrapper):
+
+    def ping(self, raw):
+        raw.ping(False)
@@ -0,0 +1,28 @@
+"""SQLite backend drawing its connections from hostel_inventory.dbpool (for local runs)."""
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from hostel_inventory.dbpool import PooledDatabaseMixin
+
+
+class DatabaseWrapper(PooledDatabaseMixin, SQLiteDatabaseWrapper):
+    """
+    Also accepts ``OPTIONS = {'transaction_mode': 'IMMEDIATE'}`` (as Django
+    5.1 does): transactions take the write lock when they begin, so
+    concurrent writers wait up to ``timeout`` instead of failing with
+    "database is locked" when a read lock can't be upgraded.
+    """
+    transaction_mode = None
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.transaction_mode = params.pop('transaction_mode', None)
+        return params
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
+
+    def ping(self, raw):
+        raw.execute('SELECT 1').fetchall()
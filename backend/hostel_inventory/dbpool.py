@@ -0,0 +1,224 @@
+"""
+Database Connection Pool
+========================
+
+Optional process-wide pool behind Django's usual connection handling. The
+pooled engines in ``hostel_inventory.db`` hand Django a connection from the
+pool instead of opening one, and take it back when Django closes it (at the
+end of a request with ``CONN_MAX_AGE = 0``). Idle connections are pinged
+before reuse once they have sat for ``PING_AFTER`` seconds, and recycled
+after ``MAX_LIFETIME``.
+
+Enable it per database::
+
+    'ENGINE': 'hostel_inventory.db.mysql',
+    'CONN_MAX_AGE': 0,
+    'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 5},
+
+``pool_stats()`` reports size, idle/in-use counts, waits and timeouts.
+"""
+
+import threading
+import time
+
+POOL_DEFAULTS = {
+    'MAX_SIZE': 10,
+    # Seconds to wait for a free connection before giving up
+    'TIMEOUT': 5,
+    'MAX_LIFETIME': 600,
+    'PING_AFTER': 5,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, alias, max_size, timeout, max_lifetime, ping_after):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.condition = threading.Condition()
+        # (raw connection, created at, returned at), most recently returned last
+        self.idle = []
+        self.born = {}
+        self.size = 0
+        self.peak_in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, connect, ping):
+        """Return ``(raw connection, reused)``; ``connect()`` opens a new one."""
+        deadline = None
+        while True:
+            with self.condition:
+                if self.idle:
+                    raw, created_at, returned_at = self.idle.pop()
+                elif self.size < self.max_size:
+                    # Reserve the slot, then connect outside the lock
+                    self.size += 1
+                    break
+                else:
+                    if deadline is None:
+                        deadline = time.monotonic() + self.timeout
+                        self.waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f'No free database connection for "{self.alias}" after {self.timeout}s '
+                            f'({self.max_size} in use)'
+                        )
+                    started = time.monotonic()
+                    self.condition.wait(remaining)
+                    self.wait_seconds += time.monotonic() - started
+                    continue
+
+            now = time.monotonic()
+            if now - created_at < self.max_lifetime and \
+                    (now - returned_at < self.ping_after or self.healthy(raw, ping)):
+                with self.condition:
+                    self.reused += 1
+                    self.track_peak()
+                return raw, True
+            with self.condition:
+                self.discard(raw)
+
+        try:
+            raw = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created += 1
+            self.born[id(raw)] = time.monotonic()
+            self.track_peak()
+        return raw, False
+
+    def release(self, raw, reusable=True):
+        if reusable:
+            try:
+                # Never hand a half-finished transaction to the next user
+                raw.rollback()
+            except Exception:
+                reusable = False
+        with self.condition:
+            created_at = self.born.get(id(raw), 0)
+            if reusable and time.monotonic() - created_at < self.max_lifetime:
+                self.idle.append((raw, created_at, time.monotonic()))
+            else:
+                self.discard(raw)
+            self.condition.notify()
+
+    def discard(self, raw):
+        # Called with the lock held
+        self.size -= 1
+        self.discarded += 1
+        self.born.pop(id(raw), None)
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def healthy(self, raw, ping):
+        try:
+            ping(raw)
+            return True
+        except Exception:
+            return False
+
+    def track_peak(self):
+        self.peak_in_use = max(self.peak_in_use, self.size - len(self.idle))
+
+    def close_idle(self):
+        with self.condition:
+            while self.idle:
+                self.discard(self.idle.pop()[0])
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'peak_in_use': self.peak_in_use,
+                'created': self.created,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'wait_seconds': round(self.wait_seconds, 3),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                options = {**POOL_DEFAULTS, **(settings_dict.get('POOL') or {})}
+                pool = _pools[alias] = ConnectionPool(
+                    alias,
+                    max_size=options['MAX_SIZE'],
+                    timeout=options['TIMEOUT'],
+                    max_lifetime=options['MAX_LIFETIME'],
+                    ping_after=options['PING_AFTER'],
+                )
+    return pool
+
+
+def pool_stats():
+    """``{alias: stats}`` for every pool opened in this process."""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def close_idle():
+    """Close every idle pooled connection, e.g. before replacing the database file."""
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+class PooledDatabaseMixin:
+    """
+    Mixed into a backend's DatabaseWrapper. Subclasses implement ``ping(raw)``.
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        try:
+            raw, self.pool_reused = pool.acquire(lambda: super(PooledDatabaseMixin, self).get_new_connection(conn_params), self.ping)
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+        return raw
+
+    def init_connection_state(self):
+        # Session settings survive on a pooled connection; only set them once
+        if not getattr(self, 'pool_reused', False):
+            super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.settings_dict)
+        # Closed inside atomic(): Django keeps a reference, so don't lend it out again
+        reusable = not self.in_atomic_block and not (self.errors_occurred and not self.is_usable())
+        pool.release(self.connection, reusable)
+
+    def ping(self, raw):
+        raise NotImplementedError
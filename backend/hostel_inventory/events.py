@@ -0,0 +1,154 @@
+"""
+Live Events
+===========
+
+In-process broadcast hub feeding the server-sent events stream. Model
+signals publish create/update/delete events once the transaction commits;
+every open stream holds an asyncio queue on the ASGI event loop and only
+receives the events matching its hostel/room/topic filters.
+
+The hub is per process, so run the stream under a single ASGI worker (or
+put a shared broker in front of it) when scaling out.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from .signals import deleted_in_bulk, rows_changed
+
+KEEPALIVE_SECONDS = 15
+# Streams end after this long and EventSource reconnects, so a stream whose
+# client vanished without the server noticing cannot live forever
+MAX_STREAM_SECONDS = 300
+QUEUE_SIZE = 1000
+
+
+class Subscription:
+
+    def __init__(self, loop, topics=None, hostel_name=None, room_id=None):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.topics = topics
+        self.hostel_name = hostel_name
+        self.room_id = room_id
+        self.overflowed = False
+
+    def matches(self, event):
+        if self.topics and event['topic'] not in self.topics:
+            return False
+        if event['action'] == 'bulk':
+            return True
+        if self.hostel_name and event.get('hostel_name') != self.hostel_name:
+            return False
+        if self.room_id and event.get('room') != self.room_id:
+            return False
+        return True
+
+    def offer(self, event):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventHub:
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, **filters):
+        subscription = Subscription(asyncio.get_running_loop(), **filters)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event):
+        """Thread-safe; called from sync views running in worker threads."""
+        event['id'] = next(self._ids)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.matches(event):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.offer, event)
+                except RuntimeError:
+                    # Loop already closed; the stream is gone
+                    self.unsubscribe(subscription)
+
+
+hub = EventHub()
+
+
+def format_event(event):
+    data = json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"id: {event['id']}\nevent: {event['topic']}.{event['action']}\ndata: {data}\n\n"
+
+
+async def event_stream(subscription):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MAX_STREAM_SECONDS
+    try:
+        yield 'retry: 3000\n\n'
+        while loop.time() < deadline:
+            if subscription.overflowed:
+                # Events were dropped; tell the client to refetch instead
+                subscription.overflowed = False
+                yield 'event: resync\ndata: {}\n\n'
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def track_events(model, serializer_class, topic):
+    """Publish ``<topic>.created/updated/deleted/bulk`` events for ``model``."""
+
+    def build(instance, action):
+        room = instance.room if instance.room_id else None
+        return {
+            'topic': topic,
+            'action': action,
+            'room': instance.room_id,
+            'hostel_name': room.hostel_name if room else None,
+            'data': serializer_class(instance).data if action != 'deleted' else {'id': instance.pk},
+        }
+
+    def saved(sender, instance, created, **kwargs):
+        if hub.has_subscribers():
+            event = build(instance, 'created' if created else 'updated')
+            transaction.on_commit(lambda: hub.publish(event))
+
+    def deleted(sender, instance, **kwargs):
+        # A bulk delete publishes one ``bulk`` event instead
+        if hub.has_subscribers() and not deleted_in_bulk(sender):
+            event = build(instance, 'deleted')
+            transaction.on_commit(lambda: hub.publish(event))
+
+    def bulk(sender, **kwargs):
+        if hub.has_subscribers():
+            event = {'topic': topic, 'action': 'bulk'}
+            transaction.on_commit(lambda: hub.publish(event))
+
+    uid = f'track-events-{model._meta.label_lower}'
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=f'{uid}-save')
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'{uid}-delete')
+    rows_changed.connect(bulk, sender=model, weak=False, dispatch_uid=f'{uid}-bulk')
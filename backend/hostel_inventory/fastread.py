@@ -0,0 +1,191 @@
+"""
+Fast Read Path
+==============
+
+Serializer-free GET list/retrieve for plain JSON requests. Rows are fetched
+with ``.values()`` and turned into output dicts by a RowMapper compiled once
+from the viewset's serializer, then encoded with orjson when it is
+installed. The output matches the serializer field for field, including
+DRF's datetime format and its habit of leaving out a dotted-source field
+whose relation is NULL.
+"""
+
+from importlib import import_module
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import ForeignKey
+from django.http import Http404, HttpResponse
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def drf_datetime(value):
+    """Same string DRF's DateTimeField produces with the default ISO 8601 format."""
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    text = value.isoformat()
+    if text.endswith('+00:00'):
+        text = text[:-6] + 'Z'
+    return text
+
+
+def drf_date(value):
+    return value.isoformat()
+
+
+class RowMapper:
+    """
+    Builds one output dict per ``.values()`` row. ``columns`` is a list of
+    ``(output key, values() lookup, converter, omit_if_none)`` in output order.
+    """
+
+    def __init__(self, columns):
+        self.keys = [key for key, _, _, _ in columns]
+        self.lookups = list(dict.fromkeys(lookup for _, lookup, _, _ in columns))
+        self.getter = itemgetter(*[lookup for _, lookup, _, _ in columns])
+        self.converters = [(key, convert) for key, _, convert, _ in columns if convert]
+        self.omit_if_none = [key for key, _, _, omit in columns if omit]
+        if len(columns) == 1:
+            getter = self.getter
+            self.getter = lambda row: (getter(row),)
+
+    def __call__(self, row):
+        out = dict(zip(self.keys, self.getter(row)))
+        for key, convert in self.converters:
+            value = out[key]
+            if value is not None:
+                out[key] = convert(value)
+        for key in self.omit_if_none:
+            if out[key] is None:
+                del out[key]
+        return out
+
+
+def compile_mapper(serializer, method_fields):
+    """
+    Derive the mapper from the serializer's (possibly ``?fields=``-narrowed)
+    fields. ``method_fields`` maps SerializerMethodField names to the
+    annotation that holds the same value.
+    """
+    model = serializer.Meta.model
+    columns = []
+    for name, field in serializer.fields.items():
+        if getattr(field, 'write_only', False):
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_fields:
+                return None
+            columns.append((name, method_fields[name], None, False))
+            continue
+        if field.source == '*':
+            return None
+        parts = field.source.split('.')
+        lookup = '__'.join(parts)
+        if len(parts) == 1 and isinstance(model._meta.get_field(parts[0]), ForeignKey):
+            # values('room') yields the id, as PrimaryKeyRelatedField does
+            if not isinstance(field, serializers.PrimaryKeyRelatedField):
+                return None
+        elif len(parts) == 1 and not model._meta.get_field(parts[0]).concrete:
+            return None
+        convert = None
+        if isinstance(field, serializers.DateTimeField):
+            convert = drf_datetime
+        elif isinstance(field, serializers.DateField):
+            convert = drf_date
+        elif not isinstance(field, (serializers.CharField, serializers.IntegerField,
+                                    serializers.BooleanField, serializers.ChoiceField,
+                                    serializers.PrimaryKeyRelatedField)):
+            return None
+        columns.append((name, lookup, convert, len(parts) > 1))
+    return RowMapper(columns)
+
+
+def render_json(data):
+    if orjson is None:
+        return JSONRenderer().render(data)
+    content = orjson.dumps(data)
+    # JSONRenderer escapes these two so the output is also valid JavaScript
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastReadMixin:
+    """
+    Serves GET list/retrieve without serializer instances when the response
+    is plain JSON. Other formats (browsable API, compact, msgpack) and any
+    serializer the mapper cannot reproduce fall back to the normal path.
+    """
+    fast_method_fields = {}
+    fast_read = True
+
+    def get_row_mapper(self):
+        if not self.fast_read:
+            return None
+        if not isinstance(self.request.accepted_renderer, JSONRenderer) or \
+                self.request.accepted_renderer.format != 'json':
+            return None
+        return compile_mapper(self.get_serializer(), self.fast_method_fields)
+
+    def get_fast_queryset(self, mapper):
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        extra = [name.lstrip('-') for name in ordering if isinstance(name, str)]
+        pk_name = queryset.model._meta.pk.attname
+        return queryset.values(*dict.fromkeys(mapper.lookups + extra + [pk_name]))
+
+    def list(self, request, *args, **kwargs):
+        mapper = self.get_row_mapper()
+        if mapper is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_fast_queryset(mapper)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            data = {
+                'next': self.paginator.get_next_link(),
+                'results': [mapper(row) for row in page],
+            }
+        else:
+            data = [mapper(row) for row in queryset]
+        return HttpResponse(render_json(data), content_type='application/json')
+
+    def retrieve(self, request, *args, **kwargs):
+        mapper = self.get_row_mapper()
+        if mapper is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            row = self.get_fast_queryset(mapper).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            row = None
+        if row is None:
+            raise Http404
+        return HttpResponse(render_json(mapper(row)), content_type='application/json')
+
+
+def serve(request, fast_read):
+    """
+    Run ``request`` through its viewset with the fast path switched on or off
+    for that one view instance, for comparing the two paths side by side.
+    Middleware doesn't run, so a request without a session gets an empty one.
+    """
+    if not hasattr(request, 'session'):
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    match = resolve(request.path_info)
+    view = match.func.cls.as_view(match.func.actions, **{**match.func.initkwargs, 'fast_read': fast_read})
+    response = view(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
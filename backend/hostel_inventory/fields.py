@@ -0,0 +1,79 @@
+"""
+Sparse Fieldsets
+================
+
+``?fields=id,name,condition`` narrows GET responses to the listed fields.
+The serializer drops the other fields, and SparseFieldsFilter defers the
+matching columns, so neither the SELECT nor ``to_representation`` pays for
+them. Names the serializer doesn't have are rejected with a 400 listing them.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+FIELDS_PARAM = 'fields'
+
+
+def requested_fields(request):
+    if request is None or request.method != 'GET':
+        return None
+    raw = request.query_params.get(FIELDS_PARAM)
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+class SparseFieldsMixin:
+    """Serializer mixin dropping every field not named in ``?fields=``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted:
+            unknown = [name for name in wanted if name not in self.fields]
+            if unknown:
+                raise ValidationError({FIELDS_PARAM: [f'Unknown fields: {", ".join(unknown)}']})
+            for name in set(self.fields) - set(wanted):
+                self.fields.pop(name)
+
+
+def model_columns(model, serializer_fields):
+    """Map serializer fields to ``only()`` names and relations to join."""
+    columns = {'pk'}
+    relations = set()
+    for field in serializer_fields.values():
+        if field.source == '*':
+            continue
+        parts = field.source.split('.')
+        try:
+            model_field = model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            # Method fields and annotations are not columns
+            continue
+        if not model_field.concrete:
+            continue
+        columns.add(parts[0])
+        if len(parts) > 1 and model_field.is_relation:
+            relations.add(parts[0])
+            columns.add('__'.join(parts))
+    return columns, relations
+
+
+class SparseFieldsFilter(BaseFilterBackend):
+    """
+    Defers the columns ``?fields=`` left out. Runs last so ordering columns
+    chosen by earlier backends stay loaded for keyset pagination.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if requested_fields(request) is None:
+            return queryset
+        serializer = view.get_serializer()
+        columns, relations = model_columns(queryset.model, serializer.fields)
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        columns.update(name.lstrip('-') for name in ordering if isinstance(name, str))
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
@@ -0,0 +1,62 @@
+"""
+Query Parameter Filters
+=======================
+
+Exact-match and range filters declared per viewset, without pulling in
+django-filter. Each entry of ``filter_fields`` maps a query parameter to an
+ORM lookup; values are coerced with the target model field so a bad value is
+a 400 instead of a database error.
+"""
+
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.constants import LOOKUP_SEP
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+RANGE_LOOKUPS = ('gte', 'gt', 'lte', 'lt')
+
+
+def resolve_field(model, lookup):
+    """Follow ``room__hostel_name``-style lookups to the final model field."""
+    parts = lookup.split(LOOKUP_SEP)
+    if parts[-1] in RANGE_LOOKUPS:
+        parts = parts[:-1]
+    field = None
+    for part in parts:
+        field = model._meta.get_field(part)
+        if field.is_relation:
+            model = field.related_model
+    if field.is_relation:
+        field = field.target_field
+    return field
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    ``filter_fields = {'param': 'orm__lookup'}`` on the viewset, e.g.
+    ``{'hostel_name': 'room__hostel_name', 'reported_after': 'reported_at__gte'}``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filter_fields = getattr(view, 'filter_fields', {})
+        filters = {}
+        errors = {}
+        for param, lookup in filter_fields.items():
+            value = request.query_params.get(param)
+            if value in (None, ''):
+                continue
+            field = resolve_field(queryset.model, lookup)
+            try:
+                value = field.to_python(value)
+            except DjangoValidationError as e:
+                errors[param] = e.messages
+                continue
+            if isinstance(value, datetime) and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            filters[lookup] = value
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
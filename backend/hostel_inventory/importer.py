@@ -0,0 +1,233 @@
+"""
+CSV Import
+==========
+
+Streaming importers for room and asset spreadsheets. Rows are parsed one at
+a time, validated against the model choices, and written in batches: rooms
+are upserted on ``room_number`` and assets are inserted with their
+``room_number`` resolved through a lookup preloaded with one query.
+"""
+
+import csv
+import io
+from abc import ABC, abstractmethod
+
+from django.db import connections, router, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from assets.models import Asset
+from rooms.models import Room
+from .signals import rows_changed
+
+
+class RoomLookup:
+    """``room_number`` -> ``Room.id`` loaded once, instead of one query per row."""
+
+    def __init__(self):
+        self.ids = dict(Room.objects.values_list('room_number', 'id'))
+
+    def get(self, room_number):
+        return self.ids.get(room_number)
+
+
+def open_text(file):
+    """Wrap a binary upload in a text stream without reading it into memory."""
+    if isinstance(file, io.TextIOBase):
+        return file
+    return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+
+
+def parse_int(value, default, field, errors):
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        errors[field] = f'"{value}" is not an integer'
+        return default
+
+
+class CsvImporter(ABC):
+    model = None
+    batch_size = 1000
+    max_reported_errors = 1000
+    required_columns = []
+
+    def __init__(self, batch_size=None, progress=None):
+        if batch_size:
+            self.batch_size = batch_size
+        self.progress = progress
+        self.processed = 0
+        self.written = 0
+        self.error_count = 0
+        self.errors = []
+
+    def run(self, file):
+        reader = csv.DictReader(open_text(file))
+        missing = [column for column in self.required_columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f'Missing columns: {", ".join(missing)}')
+
+        batch = []
+        for line, row in enumerate(reader, start=2):
+            self.processed += 1
+            row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+            obj, errors = self.clean_row(row)
+            if errors:
+                self.add_error(line, errors)
+            else:
+                batch.append(obj)
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        return self.summary()
+
+    def flush(self, batch):
+        with transaction.atomic():
+            changes = self.write(batch)
+            rows_changed.send(sender=self.model, **changes)
+        self.written += len(batch)
+        if self.progress:
+            self.progress(self.summary())
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def summary(self):
+        return {
+            'processed': self.processed,
+            'written': self.written,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    @abstractmethod
+    def clean_row(self, row):
+        """``(obj, None)`` for a valid row, ``(None, {field: message})`` otherwise."""
+
+    @abstractmethod
+    def write(self, batch):
+        """Save the batch and return the ``rows_changed`` arguments describing it."""
+
+
+class RoomImporter(CsvImporter):
+    """Columns: room_number, hostel_name, floor (optional), capacity (optional)."""
+    model = Room
+    required_columns = ['room_number', 'hostel_name']
+
+    def clean_row(self, row):
+        errors = {}
+        room_number = row.get('room_number', '')
+        hostel_name = row.get('hostel_name', '')
+        if not room_number:
+            errors['room_number'] = 'This field is required'
+        elif len(room_number) > Room._meta.get_field('room_number').max_length:
+            errors['room_number'] = 'Too long'
+        if not hostel_name:
+            errors['hostel_name'] = 'This field is required'
+        elif len(hostel_name) > Room._meta.get_field('hostel_name').max_length:
+            errors['hostel_name'] = 'Too long'
+        floor = parse_int(row.get('floor'), None, 'floor', errors)
+        capacity = parse_int(row.get('capacity'), 2, 'capacity', errors)
+        if errors:
+            return None, errors
+        return Room(room_number=room_number, hostel_name=hostel_name, floor=floor, capacity=capacity), None
+
+    def write(self, batch):
+        # Last row wins when a sheet repeats a room number within one batch
+        rooms = {room.room_number: room for room in batch}
+        existing = Room.objects.in_bulk(list(rooms), field_name='room_number')
+        db = router.db_for_write(Room)
+        # MySQL's ON DUPLICATE KEY UPDATE can't name the key; it only has the one unique column anyway
+        target = {'unique_fields': ['room_number']} if connections[db].features.supports_update_conflicts_with_target else {}
+        Room.objects.using(db).bulk_create(
+            rooms.values(),
+            update_conflicts=True,
+            update_fields=['hostel_name', 'floor', 'capacity', 'updated_at'],
+            **target,
+        )
+        # Upserts don't return ids
+        created = [room for room_number, room in rooms.items() if room_number not in existing]
+        if created:
+            ids = dict(Room.objects.using(db).filter(room_number__in=[room.room_number for room in created])
+                       .values_list('room_number', 'id'))
+            for room in created:
+                room.pk = ids.get(room.room_number)
+        updated = []
+        for room_number, room in rooms.items():
+            before = existing.get(room_number)
+            if before is not None:
+                room.pk = before.pk
+                updated.append((before, room))
+        return {'created': created, 'updated': updated}
+
+
+class AssetImporter(CsvImporter):
+    """Columns: name, asset_type, condition (optional), total_quantity (optional), room_number (optional)."""
+    model = Asset
+    required_columns = ['name', 'asset_type']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rooms = RoomLookup()
+        self.asset_types = {choice for choice, _ in Asset.ASSET_TYPE_CHOICES}
+        self.conditions = {choice for choice, _ in Asset.CONDITION_CHOICES}
+
+    def clean_row(self, row):
+        errors = {}
+        name = row.get('name', '')
+        asset_type = row.get('asset_type', '')
+        condition = row.get('condition') or 'Good'
+        room_number = row.get('room_number', '')
+
+        if not name:
+            errors['name'] = 'This field is required'
+        elif len(name) > Asset._meta.get_field('name').max_length:
+            errors['name'] = 'Too long'
+        if asset_type not in self.asset_types:
+            errors['asset_type'] = f'"{asset_type}" is not a valid choice'
+        if condition not in self.conditions:
+            errors['condition'] = f'"{condition}" is not a valid choice'
+        total_quantity = parse_int(row.get('total_quantity'), 1, 'total_quantity', errors)
+
+        room_id = None
+        if room_number:
+            room_id = self.rooms.get(room_number)
+            if room_id is None:
+                errors['room_number'] = f'Room "{room_number}" does not exist'
+
+        if errors:
+            return None, errors
+        return Asset(
+            name=name,
+            asset_type=asset_type,
+            condition=condition,
+            total_quantity=total_quantity,
+            room_id=room_id,
+        ), None
+
+    def write(self, batch):
+        Asset.objects.bulk_create(batch)
+        return {'created': batch}
+
+
+class CsvImportMixin:
+    """Adds ``POST <prefix>/import/`` taking a multipart ``file`` upload."""
+    importer_class = None
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_csv(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'CSV file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            summary = self.importer_class().run(upload)
+        except (ValueError, csv.Error) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary, status=status.HTTP_200_OK)
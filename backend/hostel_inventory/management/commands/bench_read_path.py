@@ -0,0 +1,62 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from hostel_inventory.fastread import serve
+from hostel_inventory.seed import seed_dataset
+
+URLS = [
+    '/api/rooms/?paginate=false',
+    '/api/assets/assets/',
+    '/api/assets/assets/?paginate=false',
+    '/api/assets/assets/?paginate=false&fields=id,name,asset_type,room',
+    '/api/assets/damage-reports/?paginate=false',
+    '/api/assets/assets/{asset_id}/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare the serializer and fast read paths on the list/detail endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=200, help='Rooms per hostel')
+        parser.add_argument('--hostels', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def timed(self, factory, url, fast, repeat):
+        best = None
+        for _ in range(repeat):
+            # Clear the cache so ETag versions never short-circuit the request
+            cache.clear()
+            started = time.perf_counter()
+            response = serve(factory.get(url), fast)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
+        return best, response.content
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        failures = []
+        with transaction.atomic():
+            ids = seed_dataset(hostels=options['hostels'], rooms_per_hostel=options['rooms'], prefix='bench')
+            try:
+                for url in URLS:
+                    url = url.format(**ids)
+                    slow, slow_body = self.timed(factory, url, False, options['repeat'])
+                    fast, fast_body = self.timed(factory, url, True, options['repeat'])
+                    if slow_body != fast_body:
+                        failures.append(url)
+                    self.stdout.write(
+                        f'{url:70} {slow * 1000:8.1f}ms -> {fast * 1000:8.1f}ms  '
+                        f'x{slow / fast:4.1f}  {len(fast_body):>9} bytes'
+                    )
+            finally:
+                transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError('Fast path output differs from the serializer for:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Fast path output identical to the serializer path'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from hostel_inventory.querybudget import measure, over_budget
+from hostel_inventory.seed import seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Check that every list/detail endpoint stays within its SQL query budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=20,
+                            help='Rooms per hostel in the larger dataset')
+
+    def handle(self, *args, **options):
+        # Seed inside a transaction that is always rolled back
+        with transaction.atomic():
+            rows = measure(
+                lambda: seed_dataset(hostels=1, rooms_per_hostel=2, prefix='budget-a'),
+                lambda: seed_dataset(hostels=3, rooms_per_hostel=options['rooms'], prefix='budget-b'),
+            )
+            transaction.set_rollback(True)
+
+        for label, small, large, budget in rows:
+            self.stdout.write(f'{label:32} {small:>3} -> {large:>3}  (budget {budget})')
+
+        failures = over_budget(rows)
+        if failures:
+            raise CommandError('Query budget exceeded:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('All endpoints within query budget'))
@@ -0,0 +1,129 @@
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from hostel_inventory import benchmark, dbpool
+from hostel_inventory.seed import seed_dataset
+
+
+class Command(BaseCommand):
+    help = ('Seed a SQLite dataset and benchmark every route through the WSGI and ASGI apps. '
+            'Run with --settings=hostel_inventory.bench_settings.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hostels', type=int, default=5)
+        parser.add_argument('--rooms', type=int, default=40, help='Rooms per hostel')
+        parser.add_argument('--assets', type=int, default=5, help='Assets per room')
+        parser.add_argument('--reports', type=int, default=2, help='Damage reports per room')
+        parser.add_argument('--users', type=int, default=200, help='Staff accounts besides the Warden')
+        parser.add_argument('--requests', type=int, default=50, help='Calls per endpoint and app')
+        parser.add_argument('--password-requests', type=int, default=10,
+                            help='Calls per endpoint and app for endpoints that hash a password')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--app', choices=sorted(benchmark.RUNNERS), action='append',
+                            help='Only this app (repeatable); default both')
+        parser.add_argument('--only', action='append', metavar='URL_NAME',
+                            help='Only this URL name (repeatable)')
+        parser.add_argument('--output', help='JSON results file (default benchmarks/<timestamp>.json, gitignored)')
+        parser.add_argument('--compare', help='Earlier results file to print p95 changes against')
+
+    def handle(self, *args, **options):
+        if benchmark.httpx is None:
+            raise CommandError('The benchmark needs httpx (pip install httpx)')
+        if connection.vendor != 'sqlite':
+            raise CommandError('The benchmark recreates its database; run it with '
+                               '--settings=hostel_inventory.bench_settings')
+        uncovered = benchmark.uncovered_routes()
+        if uncovered:
+            raise CommandError(f'No benchmark scenario for: {", ".join(uncovered)}')
+
+        self.reset_database()
+        dataset = {key: options[key] for key in ('hostels', 'rooms', 'assets', 'reports', 'users')}
+        self.stdout.write(f'Seeding {dataset}...')
+        ids = seed_dataset(
+            hostels=options['hostels'],
+            rooms_per_hostel=options['rooms'],
+            assets_per_room=options['assets'],
+            reports_per_room=options['reports'],
+            users=options['users'],
+            prefix='bench',
+        )
+
+        started = time.time()
+        results = benchmark.run_benchmarks(
+            ids,
+            requests=options['requests'],
+            password_requests=options['password_requests'],
+            concurrency=options['concurrency'],
+            apps=options['app'] or ['wsgi', 'asgi'],
+            only=options['only'],
+            progress=self.report,
+        )
+
+        output = Path(options['output'] or Path('benchmarks') / time.strftime('%Y%m%d-%H%M%S.json'))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(started)),
+            'duration_s': round(time.time() - started, 1),
+            'commit': self.git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'cpus': os.cpu_count(),
+            'dataset': dataset,
+            'requests': options['requests'],
+            'password_requests': options['password_requests'],
+            'concurrency': options['concurrency'],
+            'excluded': benchmark.EXCLUDED,
+            'results': results,
+        }, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Results saved to {output}'))
+
+        if options['compare']:
+            self.compare(json.loads(Path(options['compare']).read_text())['results'], results)
+
+        errors = sum(stats['errors'] for endpoints in results.values() for stats in endpoints.values())
+        if errors:
+            raise CommandError(f'{errors} calls returned an unexpected status')
+
+    def reset_database(self):
+        name = settings.DATABASES['default']['NAME']
+        connection.close()
+        dbpool.close_idle()
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            Path(f'{name}{suffix}').unlink(missing_ok=True)
+        call_command('migrate', verbosity=0)
+
+    def report(self, app, scenario, stats):
+        latency = stats['latency_ms']
+        line = (f'{app:4} {scenario.label:36} p50 {latency["p50"]:8.1f}ms  p95 {latency["p95"]:8.1f}ms  '
+                f'p99 {latency["p99"]:8.1f}ms  {stats["throughput_rps"]:7.1f} req/s  '
+                f'{stats["queries"]["mean"]:5.1f} queries')
+        if stats['errors']:
+            line = self.style.ERROR(f'{line}  {stats["errors"]} unexpected: {stats["status_codes"]}')
+        self.stdout.write(line)
+
+    def compare(self, before, after):
+        self.stdout.write('\np95 change against the earlier run:')
+        for app, endpoints in after.items():
+            for label, stats in endpoints.items():
+                old = before.get(app, {}).get(label)
+                if not old:
+                    continue
+                was, now = old['latency_ms']['p95'], stats['latency_ms']['p95']
+                change = f'{(now - was) / was * 100:+6.1f}%' if was else '     n/a'
+                self.stdout.write(f'{app:4} {label:36} {was:8.1f}ms -> {now:8.1f}ms  {change}')
+
+    def git_commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  check=True, cwd=settings.BASE_DIR).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,255 @@
+"""
+Request Metrics
+===============
+
+Per-view request metrics in Prometheus text format, served at
+``/api/metrics/``. ``MetricsMiddleware`` records, for every resolved URL name
+(``login``, ``asset-list``, ``dashboard-summary``, ...) and method:
+
+- request count by status code
+- latency histogram
+- SQL queries per request (histogram) and total query time
+- response size histogram (streamed responses are counted but not sized)
+
+Each thread writes only to its own shard, so recording takes no lock; a
+scrape sums the shards. When a thread exits its shard is folded into a
+single total for finished threads, so short-lived threads don't pile up.
+Counters are per process: with several worker processes, scrape each one
+(or put them behind something that does). Connection pool and password
+hashing pool statistics are exported too.
+
+The endpoint is only served to ``METRICS_ALLOWED_IPS`` or, when
+``METRICS_TOKEN`` is set, to requests sending ``Authorization: Bearer
+<token>``.
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from . import querycount
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+UNMATCHED = '<unmatched>'
+# Anything else is recorded as OTHER so clients can't invent label values
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+DEFAULT_ALLOWED_IPS = ('127.0.0.1', '::1')
+
+
+class Series:
+    """Everything recorded for one view and method in one thread."""
+    __slots__ = ('statuses', 'latency', 'latency_sum', 'queries', 'queries_sum', 'query_seconds',
+                 'sizes', 'size_sum')
+
+    def __init__(self):
+        self.statuses = {}
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.queries = [0] * (len(QUERY_BUCKETS) + 1)
+        self.queries_sum = 0
+        self.query_seconds = 0.0
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+
+    def merge(self, other):
+        for code, count in list(other.statuses.items()):
+            self.statuses[code] = self.statuses.get(code, 0) + count
+        for mine, theirs in ((self.latency, other.latency), (self.queries, other.queries), (self.sizes, other.sizes)):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+        self.latency_sum += other.latency_sum
+        self.queries_sum += other.queries_sum
+        self.query_seconds += other.query_seconds
+        self.size_sum += other.size_sum
+
+
+class ThreadOwner:
+    """Kept in a thread's locals; dropped, and finalized, when the thread exits."""
+    __slots__ = ('__weakref__',)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+# One {(view, method): Series} per live thread that recorded a request
+_shards = {}
+# Everything recorded by threads that have exited
+_finished = {}
+
+
+def merge_shard(totals, shard):
+    for key, series in list(shard.items()):
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = Series()
+        total.merge(series)
+
+
+def retire_shard(shard):
+    with _lock:
+        del _shards[id(shard)]
+        merge_shard(_finished, shard)
+
+
+def local_shard():
+    try:
+        return _local.shard
+    except AttributeError:
+        shard = _local.shard = {}
+        _local.owner = ThreadOwner()
+        with _lock:
+            _shards[id(shard)] = shard
+        weakref.finalize(_local.owner, retire_shard, shard)
+        return shard
+
+
+def record(view, method, status, seconds, queries, query_seconds, size):
+    shard = local_shard()
+    series = shard.get((view, method))
+    if series is None:
+        series = shard[(view, method)] = Series()
+    series.statuses[status] = series.statuses.get(status, 0) + 1
+    series.latency[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    series.latency_sum += seconds
+    series.queries[bisect_left(QUERY_BUCKETS, queries)] += 1
+    series.queries_sum += queries
+    series.query_seconds += query_seconds
+    if size is not None:
+        series.sizes[bisect_left(SIZE_BUCKETS, size)] += 1
+        series.size_sum += size
+
+
+def collect():
+    """``{(view, method): Series}`` summed over every thread."""
+    totals = {}
+    with _lock:
+        merge_shard(totals, _finished)
+        for shard in _shards.values():
+            merge_shard(totals, shard)
+    return totals
+
+
+class MetricsMiddleware:
+    """Put it first in MIDDLEWARE so the timing covers the rest of the stack."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        querycount.install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with querycount.counting_queries() as counter:
+            response = self.get_response(request)
+        self.observe(request, response, started, counter)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with querycount.counting_queries() as counter:
+            response = await self.get_response(request)
+        self.observe(request, response, started, counter)
+        return response
+
+    def observe(self, request, response, started, counter):
+        match = request.resolver_match
+        record(
+            (match.url_name or match.view_name) if match else UNMATCHED,
+            request.method if request.method in METHODS else 'OTHER',
+            response.status_code,
+            time.perf_counter() - started,
+            counter.count,
+            counter.duration,
+            None if response.streaming else len(response.content),
+        )
+
+
+def allowed(request):
+    """Whether ``request`` may read the metrics (see the module docstring)."""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        return constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', DEFAULT_ALLOWED_IPS)
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(**values):
+    if not values:
+        return ''
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in values.items()) + '}'
+
+
+def histogram(lines, name, help_text, buckets, series_by_labels):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for label_values, counts, total in series_by_labels:
+        cumulative = 0
+        for bound, count in zip(buckets, counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{labels(**label_values, le=bound)} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{name}_bucket{labels(**label_values, le="+Inf")} {cumulative}')
+        lines.append(f'{name}_sum{labels(**label_values)} {total}')
+        lines.append(f'{name}_count{labels(**label_values)} {cumulative}')
+
+
+def metric(lines, name, help_text, samples, metric_type='gauge'):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {metric_type}')
+    for label_values, value in samples:
+        lines.append(f'{name}{labels(**label_values)} {value}')
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    from users.hashing import get_pool as get_hashing_pool
+    from .dbpool import pool_stats
+
+    series = sorted(collect().items())
+    lines = []
+    metric(lines, 'hostel_http_requests_total', 'Requests by view, method and status code.', [
+        ({'view': view, 'method': method, 'status': status}, count)
+        for (view, method), data in series
+        for status, count in sorted(data.statuses.items())
+    ], 'counter')
+    histogram(lines, 'hostel_http_request_duration_seconds', 'Time spent in Django per request.',
+              LATENCY_BUCKETS,
+              [({'view': view, 'method': method}, data.latency, round(data.latency_sum, 6))
+               for (view, method), data in series])
+    histogram(lines, 'hostel_http_request_db_queries', 'SQL queries per request.', QUERY_BUCKETS,
+              [({'view': view, 'method': method}, data.queries, data.queries_sum)
+               for (view, method), data in series])
+    metric(lines, 'hostel_http_request_db_seconds_total', 'Time spent in SQL queries.', [
+        ({'view': view, 'method': method}, round(data.query_seconds, 6)) for (view, method), data in series
+    ], 'counter')
+    histogram(lines, 'hostel_http_response_size_bytes', 'Response body size (non-streamed responses).',
+              SIZE_BUCKETS,
+              [({'view': view, 'method': method}, data.sizes, data.size_sum)
+               for (view, method), data in series])
+
+    pools = sorted(pool_stats().items())
+    for key, metric_type in (('size', 'gauge'), ('in_use', 'gauge'), ('idle', 'gauge'),
+                             ('waits', 'counter'), ('timeouts', 'counter')):
+        name = f'hostel_db_pool_{key}' + ('_total' if metric_type == 'counter' else '')
+        metric(lines, name, f'Database connection pool {key.replace("_", " ")}.',
+               [({'alias': alias}, stats[key]) for alias, stats in pools], metric_type)
+    hashing = get_hashing_pool().stats()
+    for key, metric_type in (('running', 'gauge'), ('queued', 'gauge'), ('completed', 'counter'),
+                             ('rejected', 'counter')):
+        name = f'hostel_password_hash_{key}' + ('_total' if metric_type == 'counter' else '')
+        metric(lines, name, f'Password hashing pool tasks {key}.', [({}, hashing[key])], metric_type)
+    return '\n'.join(lines) + '\n'
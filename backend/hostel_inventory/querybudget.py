@@ -0,0 +1,68 @@
+"""
+Query Budgets
+=============
+
+Per-endpoint limits on the number of SQL queries a request may run.
+Budgets are checked at two dataset sizes so a per-row query (N+1) shows up
+as growth even when the small run happens to fit the budget.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+# (label, url, max queries)
+ENDPOINT_BUDGETS = [
+    ('room-list', '/api/rooms/', 1),
+    ('room-list-unpaginated', '/api/rooms/?paginate=false', 1),
+    ('room-detail', '/api/rooms/{room_id}/', 1),
+    ('asset-list', '/api/assets/assets/', 1),
+    ('asset-list-unpaginated', '/api/assets/assets/?paginate=false', 1),
+    ('asset-detail', '/api/assets/assets/{asset_id}/', 1),
+    ('damage-report-list', '/api/assets/damage-reports/', 1),
+    ('damage-report-list-unpaginated', '/api/assets/damage-reports/?paginate=false', 1),
+    ('damage-report-detail', '/api/assets/damage-reports/{report_id}/', 1),
+    ('dashboard-summary', '/api/dashboard/summary/', 4),
+    ('dashboard-summary-cached', '/api/dashboard/summary/', 0),
+]
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    if response.status_code != 200:
+        raise QueryBudgetExceeded(f'{url} returned {response.status_code}')
+    return len(captured.captured_queries)
+
+
+def measure(small_ids, large_ids, budgets=ENDPOINT_BUDGETS):
+    """
+    Request every endpoint against the small and the large dataset and
+    return ``(label, small_count, large_count, budget)`` rows.
+
+    ``small_ids``/``large_ids`` are callables that seed a dataset and return
+    the ids used to fill the URL placeholders. The cache is cleared after
+    seeding so the first request of each run is a cold one.
+    """
+    client = Client()
+    results = {}
+    for seed in (small_ids, large_ids):
+        ids = seed()
+        cache.clear()
+        for label, url, budget in budgets:
+            results.setdefault(label, []).append(count_queries(client, url.format(**ids)))
+    return [(label, *results[label], budget) for label, url, budget in budgets]
+
+
+def over_budget(rows):
+    return [
+        f'{label}: {small} -> {large} queries (budget {budget})'
+        for label, small, large, budget in rows
+        if large > budget or large != small
+    ]
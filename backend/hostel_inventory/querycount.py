@@ -0,0 +1,75 @@
+"""
+Query Counting
+==============
+
+Counts SQL queries and their time for one unit of work (a request, a
+benchmark call) through a context variable. Unlike CaptureQueriesContext it
+follows the work into ``sync_to_async`` threads under ASGI and keeps
+concurrent requests apart, and it doesn't need DEBUG.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = contextvars.ContextVar('query_counter', default=None)
+
+
+class QueryCounter:
+    __slots__ = ('count', 'duration', 'parent')
+
+    def __init__(self, parent=None):
+        self.count = 0
+        self.duration = 0.0
+        # An enclosing counter (e.g. the benchmark around the metrics middleware) keeps counting
+        self.parent = parent
+
+
+def count_execute(execute, sql, params, many, context):
+    counter = _current.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        while counter is not None:
+            counter.count += 1
+            counter.duration += elapsed
+            counter = counter.parent
+
+
+def add_wrapper(sender=None, connection=None, **kwargs):
+    if count_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_execute)
+
+
+def install():
+    """Wrap every connection opened from now on, and the ones open in this thread."""
+    connection_created.connect(add_wrapper, dispatch_uid='querycount-install')
+    for connection in connections.all(initialized_only=True):
+        add_wrapper(connection=connection)
+
+
+@contextmanager
+def counting_queries():
+    counter = QueryCounter(_current.get())
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def paused():
+    """Queries run inside aren't counted by anyone (e.g. diagnostics of the request itself)."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
@@ -0,0 +1,56 @@
+"""
+List Renderers
+==============
+
+Extra response formats for the list endpoints, picked with ``?format=`` or
+the Accept header:
+
+- ``compact``: ``{"columns": [...], "rows": [[...], ...]}``, so field names
+  are sent once per response instead of once per row.
+- ``msgpack``: binary MessagePack, when the optional ``msgpack`` package is
+  installed.
+"""
+
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def to_compact(data):
+    """Turn a list of dicts (or a paginated ``results`` page) into columns + rows."""
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        compact = {key: value for key, value in data.items() if key != 'results'}
+        compact.update(to_compact(data['results']))
+        return compact
+    if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+        columns = list(data[0].keys()) if data else []
+        return {'columns': columns, 'rows': [[row.get(column) for column in columns] for row in data]}
+    return data
+
+
+class CompactJSONRenderer(JSONRenderer):
+    media_type = 'application/vnd.hostel.compact+json'
+    format = 'compact'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_compact(data), accepted_media_type, renderer_context)
+
+
+class MsgPackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=str)
+
+
+LIST_RENDERERS = [JSONRenderer, BrowsableAPIRenderer, CompactJSONRenderer]
+if msgpack is not None:
+    LIST_RENDERERS.append(MsgPackRenderer)
@@ -0,0 +1,102 @@
+"""
+Dataset Seeding
+===============
+
+Bulk-inserts a synthetic hostel inventory for query budgets and benchmarks.
+"""
+
+from django.contrib.auth.hashers import make_password
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from users.models import UserProfile
+from .signals import rows_changed
+
+SEED_PASSWORD = 'seed-password'
+
+
+def seed_dataset(hostels=2, rooms_per_hostel=5, assets_per_room=3, reports_per_room=1, users=0, prefix='seed'):
+    """
+    Insert ``hostels x rooms_per_hostel`` rooms with their assets and damage
+    reports, and return the ids of one row of each kind. With ``users``, also
+    add a ``<prefix>-warden`` Warden plus that many staff accounts, all with
+    SEED_PASSWORD.
+    """
+    asset_types = [choice for choice, _ in Asset.ASSET_TYPE_CHOICES]
+    conditions = [choice for choice, _ in Asset.CONDITION_CHOICES]
+    statuses = [choice for choice, _ in DamageReport.STATUS_CHOICES]
+
+    Room.objects.bulk_create([
+        Room(
+            room_number=f'{prefix}-{h}-{r}',
+            hostel_name=f'{prefix} Hostel {h}',
+            floor=r % 5,
+            capacity=2,
+        )
+        for h in range(hostels)
+        for r in range(rooms_per_hostel)
+    ])
+    rooms = list(Room.objects.filter(room_number__startswith=f'{prefix}-'))
+
+    assets = Asset.objects.bulk_create([
+        Asset(
+            name=f'{asset_types[i % len(asset_types)]} {i}',
+            asset_type=asset_types[i % len(asset_types)],
+            condition=conditions[i % len(conditions)],
+            room=room,
+        )
+        for room in rooms
+        for i in range(assets_per_room)
+    ], batch_size=1000)
+    reports = DamageReport.objects.bulk_create([
+        DamageReport(
+            room=room,
+            asset_type=asset_types[i % len(asset_types)],
+            description=f'Seeded damage {i}',
+            status=statuses[i % len(statuses)],
+        )
+        for room in rooms
+        for i in range(reports_per_room)
+    ], batch_size=1000)
+
+    rows_changed.send(sender=Room, created=rooms)
+    rows_changed.send(sender=Asset, created=assets)
+    rows_changed.send(sender=DamageReport, created=reports)
+
+    ids = {}
+    if users:
+        ids.update(seed_users(users, prefix))
+
+    return {
+        **ids,
+        'room_id': rooms[0].id,
+        'asset_id': Asset.objects.filter(room__in=rooms).values_list('id', flat=True).first(),
+        'report_id': DamageReport.objects.filter(room__in=rooms).values_list('id', flat=True).first(),
+    }
+
+
+def seed_users(count, prefix):
+    # One hash shared by every account; hashing each would dominate seeding
+    password = make_password(SEED_PASSWORD)
+    roles = ['Inventory Staff', 'Sub-Warden']
+    created = UserProfile.objects.bulk_create([
+        UserProfile(username=f'{prefix}-warden', email=f'{prefix}-warden@example.com', password=password, role='Warden'),
+    ] + [
+        UserProfile(
+            username=f'{prefix}-user-{i}',
+            email=f'{prefix}-user-{i}@example.com',
+            first_name=f'Staff{i}',
+            last_name=prefix.title(),
+            password=password,
+            role=roles[i % len(roles)],
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    rows_changed.send(sender=UserProfile, created=created)
+    ids = dict(UserProfile.objects.filter(username__in=[f'{prefix}-warden', f'{prefix}-user-0'])
+               .values_list('username', 'id'))
+    return {
+        'warden_id': ids[f'{prefix}-warden'],
+        'warden_username': f'{prefix}-warden',
+        'user_id': ids[f'{prefix}-user-0'],
+        'user_email': f'{prefix}-user-0@example.com',
+    }
@@ -0,0 +1,43 @@
+"""
+Session Refresh
+===============
+
+Sliding 24h sessions without a write per request. Django's
+SESSION_SAVE_EVERY_REQUEST rewrites the session row (and the cookie) on
+every call just to push the expiry forward; this middleware does the same
+refresh at most once per ``SESSION_REFRESH_INTERVAL`` seconds and otherwise
+only saves when the session data changed.
+
+An idle session therefore expires between ``SESSION_COOKIE_AGE`` minus the
+interval and ``SESSION_COOKIE_AGE`` after the last request. Works with any
+session engine, including signed cookies.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware as DjangoSessionMiddleware
+
+REFRESHED_KEY = '_session_refreshed'
+DEFAULT_REFRESH_INTERVAL = 300
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """Drop-in replacement for ``django.contrib.sessions.middleware.SessionMiddleware``."""
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is not None and not session.is_empty():
+            self.refresh_if_due(session)
+        return super().process_response(request, response)
+
+    def refresh_if_due(self, session):
+        interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+        now = int(time.time())
+        refreshed = session.get(REFRESHED_KEY, 0)
+        if session.session_key is None and not session.modified:
+            # The cookie pointed at an expired or unknown session
+            return
+        if session.modified or now - refreshed >= interval:
+            # Marks the session modified, so the parent saves it and resends the cookie
+            session[REFRESHED_KEY] = now
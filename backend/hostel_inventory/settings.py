@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import pymysql
 pymysql.install_as_MySQLdb()
@@ -20,11 +21,18 @@ INSTALLED_APPS = [
     'assets',
     'rooms',
     'dashboard',
+    'sync',
+    'outbox',
+    'hostel_inventory',
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole stack (see hostel_inventory/metrics.py)
+    'hostel_inventory.metrics.MetricsMiddleware',
+    # Inactive unless SQL_DEBUG is on
+    'hostel_inventory.sqldebug.SQLDebugMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'hostel_inventory.sessions.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -57,6 +65,18 @@ DATABASES = {
         'PASSWORD': '',
         'HOST': 'localhost',
         'PORT': '3306',
+        # Seconds each thread keeps its connection open between requests, from
+        # DB_CONN_MAX_AGE. The default 0 opens a new connection per request.
+        # Under WSGI e.g. 60 saves the connect on most requests; CONN_HEALTH_CHECKS
+        # then pings a kept connection before a request reuses it (with 0 there
+        # is never one to check). Keep 0 under ASGI, where every request can run
+        # on a new thread and kept connections pile up, and with the process-wide
+        # pool ('ENGINE': 'hostel_inventory.db.mysql' with
+        # 'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 5}, see hostel_inventory/dbpool.py),
+        # which takes each connection back when Django closes it and pings idle
+        # ones itself.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '0')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -79,8 +99,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
-    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.auth.SessionUserAuthentication',
+    ],
     'UNAUTHENTICATED_USER': None,
+    'DEFAULT_THROTTLE_RATES': {
+        'password-ip': '60/min',
+        'password-account': '10/min',
+    },
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -101,11 +127,53 @@ CSRF_TRUSTED_ORIGINS = [
 
 CSRF_COOKIE_HTTPONLY = False
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Must be shared by every worker process (Redis here; PyMemcacheCache works
+# too). Model versions behind ETags (hostel_inventory/conditional.py), the
+# dashboard summary generation (dashboard/summary.py), cached roles
+# (users/auth.py) and sessions are invalidated by writing to this cache, and
+# with a per-process cache the other workers would never see those writes.
+# `manage.py check --deploy` rejects LocMemCache; the test and benchmark
+# settings run in one process and use it.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    }
+}
+
+# Reads come from the cache and fall back to django_session; writes go to both.
+# Sessions still slide to 24h after activity, but an unchanged session is
+# rewritten at most every SESSION_REFRESH_INTERVAL seconds (see
+# hostel_inventory/sessions.py) instead of on every request.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_COOKIE_AGE = 86400
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = 300
+
+# Password hashes, bulk provisioning included, run on a bounded pool
+# (users/hashing.py); None = half the CPUs
+PASSWORD_HASH_WORKERS = None
+PASSWORD_HASH_QUEUE = 32
+
+# Delete tombstones (see sync/) after this many days; clients that last synced
+# before then get 410 and fetch a full snapshot
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+# Delete sent and failed outbox emails (see outbox/) after this many days
+OUTBOX_RETENTION_DAYS = 30
+
+# /api/metrics/ (hostel_inventory/metrics.py) answers only these addresses,
+# or, once METRICS_TOKEN is set, only requests with "Authorization: Bearer <token>"
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+METRICS_TOKEN = None
+
+# Development only: capture each request's SQL and flag N+1 patterns, slow
+# statements and full table scans in an X-SQL-Debug header and a log warning
+# (see hostel_inventory/sqldebug.py)
+SQL_DEBUG = False
+SQL_DEBUG_REPEAT = 3
+SQL_DEBUG_SLOW_MS = 100
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -0,0 +1,54 @@
+"""
+Project Signals
+===============
+
+``rows_changed`` is sent (with the model class as sender) after writes that
+bypass ``post_save``/``post_delete``, such as ``bulk_create`` and
+``bulk_update``, so caches derived from those tables can be invalidated.
+Inserted rows are passed as ``created``, updated rows as ``updated``, a list
+of ``(before, after)`` instance pairs, and deleted rows as ``deleted``, so
+receivers can apply them incrementally. A send with none of them means
+anything may have changed.
+
+Inside ``deleting_in_bulk(model)`` per-row ``post_delete`` receivers skip
+``model`` (check ``deleted_in_bulk(sender)``); the caller reports the rows
+with one ``rows_changed(deleted=...)`` instead.
+
+``track_previous(model)`` loads the stored row once before each ``save()``
+and keeps it as ``instance._previous`` (None for new rows), so every
+``post_save`` receiver can compare against it without a SELECT of its own.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import pre_save
+from django.dispatch import Signal
+
+rows_changed = Signal()
+
+_deleting_in_bulk = ContextVar('deleting_in_bulk', default=frozenset())
+
+
+@contextmanager
+def deleting_in_bulk(model):
+    token = _deleting_in_bulk.set(_deleting_in_bulk.get() | {model})
+    try:
+        yield
+    finally:
+        _deleting_in_bulk.reset(token)
+
+
+def deleted_in_bulk(model):
+    return model in _deleting_in_bulk.get()
+
+
+def track_previous(model):
+    related = [field.name for field in model._meta.concrete_fields if field.many_to_one]
+
+    def remember(sender, instance, **kwargs):
+        instance._previous = None
+        if instance.pk:
+            instance._previous = sender._default_manager.select_related(*related).filter(pk=instance.pk).first()
+
+    pre_save.connect(remember, sender=model, weak=False, dispatch_uid=f'track-previous-{model._meta.label_lower}')
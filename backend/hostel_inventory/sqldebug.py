@@ -0,0 +1,231 @@
+"""
+SQL Debug Mode
+==============
+
+Opt-in (``SQL_DEBUG = True``) capture of every SQL statement a request runs.
+Statements are grouped by shape (parameters and ``IN`` lists collapsed), and
+three kinds of problem are reported:
+
+- ``n+1``: one shape run ``SQL_DEBUG_REPEAT`` or more times in a request
+- ``slow``: a statement over ``SQL_DEBUG_SLOW_MS``
+- ``scan``: a SELECT whose ``EXPLAIN`` plan reads a whole table (checked
+  once per shape per process, on SQLite and MySQL)
+
+Each problem names the code that ran the query: the serializer field being
+rendered (``RoomSerializer.asset_count``) when there is one, otherwise the
+nearest project frame (``assets/views.py:42 in bulk``). The summary goes in
+an ``X-SQL-Debug`` response header, cut to ``MAX_HEADER_LENGTH``, and, when
+something was flagged, in a warning from the ``hostel_inventory.sqldebug``
+logger with every problem and the full shapes. The ``EXPLAIN`` queries are
+neither captured nor counted in the request's metrics.
+
+Walking the stack on every query is slow; never enable this in production.
+"""
+
+import contextvars
+import logging
+import os
+import re
+import sys
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import import_string
+from rest_framework.fields import Field
+from . import querycount
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 3
+DEFAULT_SLOW_MS = 100
+HEADER = 'X-SQL-Debug'
+MAX_HEADER_LENGTH = 512
+TRUNCATED = '; ... (see the log)'
+
+_current = contextvars.ContextVar('sql_debug_log', default=None)
+# (alias, shape) -> [scanned tables]
+_plans = {}
+
+PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+# Project middleware waiting on the view is never the code responsible
+_skip_files = {__file__}
+
+IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+NUMBER = re.compile(r'\b\d+\b')
+STRING = re.compile(r"'(?:[^']|'')*'")
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)$')
+
+
+def shape(sql):
+    sql = IN_LIST.sub('IN (...)', sql)
+    sql = STRING.sub('?', sql)
+    return NUMBER.sub('?', sql)
+
+
+def origin():
+    """The serializer field being rendered, else the innermost project frame."""
+    frame = sys._getframe(2)
+    project_frame = None
+    while frame is not None:
+        field = frame.f_locals.get('self') if frame.f_code.co_name in ('to_representation', 'get_attribute') else None
+        if isinstance(field, Field) and field.field_name and field.parent is not None:
+            return f'{type(field.parent).__name__}.{field.field_name}'
+        filename = frame.f_code.co_filename
+        if project_frame is None and filename.startswith(PROJECT_DIR) and filename not in _skip_files \
+                and 'site-packages' not in filename:
+            project_frame = f'{filename[len(PROJECT_DIR):]}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return project_frame
+
+
+class Statement:
+    __slots__ = ('alias', 'sql', 'params', 'duration', 'origin')
+
+    def __init__(self, alias, sql, params, duration, origin):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.origin = origin
+
+
+def capture_execute(execute, sql, params, many, context):
+    log = _current.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.append(Statement(context['connection'].alias, sql, None if many else params,
+                             time.perf_counter() - started, origin()))
+
+
+def add_wrapper(sender=None, connection=None, **kwargs):
+    if capture_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_execute)
+
+
+def scanned_tables(alias, sql, params):
+    """Tables the plan reads in full; ``None`` when the backend can't say."""
+    connection = connections[alias]
+    if connection.vendor not in ('sqlite', 'mysql'):
+        return None
+    token = _current.set(None)
+    try:
+        with querycount.paused(), connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+    except DatabaseError:
+        return None
+    finally:
+        _current.reset(token)
+
+    if connection.vendor == 'sqlite':
+        return [match.group(1) for match in (SQLITE_SCAN.match(row[-1]) for row in rows) if match]
+    plan = [dict(zip(columns, row)) for row in rows]
+    return [row['table'] for row in plan if row.get('type') == 'ALL']
+
+
+def analyze(statements, view='unknown'):
+    """
+    ``(issues, summary)``; issues are ``(kind, detail, origin, shape)``, with
+    ``view`` as the origin of queries no project code can be blamed for.
+    """
+    groups = {}
+    for statement in statements:
+        statement.origin = statement.origin or view
+        groups.setdefault((statement.alias, shape(statement.sql)), []).append(statement)
+
+    repeat = getattr(settings, 'SQL_DEBUG_REPEAT', DEFAULT_REPEAT)
+    slow = getattr(settings, 'SQL_DEBUG_SLOW_MS', DEFAULT_SLOW_MS) / 1000
+    issues = []
+    for (alias, sql_shape), group in groups.items():
+        if len(group) >= repeat:
+            origins = sorted({statement.origin for statement in group})
+            issues.append(('n+1', f'x{len(group)}', ', '.join(origins), sql_shape))
+        for statement in group:
+            if statement.duration >= slow:
+                issues.append(('slow', f'{statement.duration * 1000:.0f}ms', statement.origin, sql_shape))
+
+        first = group[0]
+        if not sql_shape.lstrip().upper().startswith('SELECT') or first.params is None:
+            continue
+        key = (alias, sql_shape)
+        if key not in _plans:
+            _plans[key] = scanned_tables(alias, first.sql, first.params)
+        for table in _plans[key] or ():
+            issues.append(('scan', table, first.origin, sql_shape))
+
+    total = sum(statement.duration for statement in statements)
+    summary = f'queries={len(statements)} shapes={len(groups)} time={total * 1000:.1f}ms'
+    return issues, summary
+
+
+def view_label(request):
+    match = request.resolver_match
+    if match is None:
+        return request.path
+    view = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    name = match.url_name or match.view_name
+    return f'{name} ({view.__name__})' if view else name
+
+
+class SQLDebugMiddleware:
+    """Only active with ``SQL_DEBUG = True``; put it right after MetricsMiddleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_DEBUG', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        connection_created.connect(add_wrapper, dispatch_uid='sqldebug-install')
+        for connection in connections.all(initialized_only=True):
+            add_wrapper(connection=connection)
+        for path in settings.MIDDLEWARE:
+            _skip_files.add(sys.modules[import_string(path).__module__].__file__)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        statements = []
+        token = _current.set(statements)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, statements)
+
+    async def __acall__(self, request):
+        statements = []
+        token = _current.set(statements)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        # EXPLAIN runs on the database, so off the event loop
+        return await sync_to_async(self.report)(request, response, statements)
+
+    def report(self, request, response, statements):
+        view = view_label(request)
+        issues, summary = analyze(statements, view)
+        flagged = '; '.join(f'{kind} {detail} {where}' for kind, detail, where, _ in issues)
+        header = f'{summary}; view={view}' + (f'; {flagged}' if flagged else '')
+        if len(header) > MAX_HEADER_LENGTH:
+            header = header[:MAX_HEADER_LENGTH - len(TRUNCATED)] + TRUNCATED
+        response[HEADER] = header
+        if issues:
+            logger.warning(
+                '%s %s -> %s: %s\n%s', request.method, request.path, view, summary,
+                '\n'.join(f'  {kind} {detail} at {where}: {sql_shape}' for kind, detail, where, sql_shape in issues),
+            )
+        return response
@@ -0,0 +1,378 @@
+import asyncio
+import base64
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import DatabaseError, OperationalError, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from assets.models import Asset, DamageReport
+from rooms.models import Room
+from . import checks, dbpool, events, metrics, querycount, sessions, sqldebug
+from .db.sqlite3.base import DatabaseWrapper as PooledSQLiteWrapper
+from .fastread import FastReadMixin, serve
+from .querybudget import measure, over_budget
+from .seed import seed_dataset
+
+
+class HealthTests(TestCase):
+
+    def test_ok(self):
+        response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['database'], 'ok')
+
+    def test_database_error_is_logged_not_returned(self):
+        error = DatabaseError("Access denied for user 'root'@'10.0.0.5'")
+        with mock.patch('hostel_inventory.views.connection.cursor', side_effect=error), \
+                self.assertLogs('hostel_inventory.views', 'ERROR') as logs:
+            response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['database'], 'error')
+        self.assertIn('Access denied', logs.output[0])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+
+    def test_per_process_cache_fails_the_deploy_check(self):
+        [error] = checks.check_shared_cache(None)
+        self.assertEqual(error.id, 'hostel_inventory.E001')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                           'LOCATION': 'redis://127.0.0.1:6379/0'}})
+    def test_shared_cache_passes(self):
+        self.assertEqual(checks.check_shared_cache(None), [])
+
+
+class MetricsTests(SimpleTestCase):
+
+    def test_only_allowed_addresses(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 200)
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.7').status_code, 403)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_replaces_the_allowlist(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_finished_threads_are_folded_into_one_total(self):
+        def work():
+            metrics.record('test-view', 'GET', 200, 0.01, 1, 0.001, 10)
+
+        shards = len(metrics._shards)
+        before = metrics.collect().get(('test-view', 'GET'))
+        for _ in range(5):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(metrics._shards), shards)
+        after = metrics.collect()[('test-view', 'GET')]
+        self.assertEqual(after.statuses[200] - (before.statuses[200] if before else 0), 5)
+
+
+@override_settings(SQL_DEBUG=True)
+class SQLDebugTests(TestCase):
+
+    def test_explain_is_not_counted(self):
+        querycount.install()
+        with querycount.counting_queries() as counter:
+            sqldebug.scanned_tables('default', 'SELECT * FROM rooms_room WHERE floor = %s', [1])
+        self.assertEqual(counter.count, 0)
+
+    def test_long_reports_are_cut_in_the_header(self):
+        middleware = sqldebug.SQLDebugMiddleware(lambda request: HttpResponse())
+        statements = [
+            sqldebug.Statement('default', f'UPDATE rooms_room_{i} SET floor = 1', None, 1.0, f'views.py:{i} in bulk')
+            for i in range(50)
+        ]
+        with self.assertLogs('hostel_inventory.sqldebug', 'WARNING') as logs:
+            response = middleware.report(RequestFactory().get('/api/rooms/'), HttpResponse(), statements)
+        header = response[sqldebug.HEADER]
+        self.assertEqual(len(header), sqldebug.MAX_HEADER_LENGTH)
+        self.assertTrue(header.endswith(sqldebug.TRUNCATED))
+        self.assertIn('views.py:49 in bulk', logs.output[0])
+
+
+class QueryBudgetTests(TestCase):
+
+    def test_endpoints_stay_within_budget(self):
+        rows = measure(
+            lambda: seed_dataset(hostels=1, rooms_per_hostel=2, prefix='budget-a'),
+            lambda: seed_dataset(hostels=3, rooms_per_hostel=5, prefix='budget-b'),
+        )
+        self.assertEqual(over_budget(rows), [])
+
+
+class FastReadTests(TestCase):
+    """The fast path must produce exactly the serializer's bytes."""
+
+    URLS = [
+        '/api/rooms/',
+        '/api/rooms/?paginate=false',
+        '/api/rooms/{room_id}/',
+        '/api/assets/assets/',
+        '/api/assets/assets/?paginate=false',
+        '/api/assets/assets/?paginate=false&fields=id,name,room',
+        '/api/assets/assets/{asset_id}/',
+        '/api/assets/assets/{asset_id}/?fields=id,condition',
+        '/api/assets/damage-reports/?page_size=2',
+        '/api/assets/damage-reports/{report_id}/',
+    ]
+
+    def test_fast_output_matches_the_serializer(self):
+        ids = seed_dataset(hostels=2, rooms_per_hostel=3, prefix='fast')
+        factory = RequestFactory()
+        for url in self.URLS:
+            url = url.format(**ids)
+            with self.subTest(url=url):
+                slow = serve(factory.get(url), fast_read=False)
+                fast = serve(factory.get(url), fast_read=True)
+                self.assertEqual(slow.status_code, 200)
+                # A DRF Response means the fast path fell back to the serializer
+                self.assertIsInstance(slow, Response)
+                self.assertNotIsInstance(fast, Response)
+                self.assertEqual(fast.content, slow.content)
+        # Toggled per view instance, never on the shared class
+        self.assertTrue(FastReadMixin.fast_read)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        Asset.objects.bulk_create([Asset(name=f'Bed {i}', asset_type='Bed') for i in range(5)])
+        # All on one timestamp, so only the pk suffix orders them
+        Asset.objects.update(created_at=timezone.now())
+        self.ids = sorted(Asset.objects.values_list('id', flat=True), reverse=True)
+
+    def cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def test_next_links_walk_every_row_once(self):
+        seen = []
+        url = '/api/assets/assets/?page_size=2'
+        while url:
+            body = self.client.get(url).json()
+            seen += [row['id'] for row in body['results']]
+            url = body['next']
+        self.assertEqual(seen, self.ids)
+
+    def test_ties_break_on_the_pk(self):
+        body = self.client.get('/api/assets/assets/?page_size=2').json()
+        [cursor] = parse_qs(urlsplit(body['next']).query)['cursor']
+        self.assertEqual(json.loads(base64.urlsafe_b64decode(cursor))[1], self.ids[1])
+
+    def test_bad_cursors_are_404(self):
+        for cursor in ('not-base64!', self.cursor({'a': 1}), self.cursor([1]),
+                       self.cursor(['yesterday', 1]), self.cursor([None, 1])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/assets/assets/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_paginate_false_returns_a_plain_list(self):
+        response = self.client.get('/api/assets/assets/?paginate=false')
+        self.assertEqual([row['id'] for row in response.json()], self.ids)
+
+
+class FieldFilterTests(TestCase):
+
+    def setUp(self):
+        self.north = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        self.south = Room.objects.create(room_number='B2', hostel_name='South', floor=2)
+        self.bed = Asset.objects.create(name='Bed 1', asset_type='Bed', room=self.north)
+        self.fan = Asset.objects.create(name='Fan 1', asset_type='Fan', condition='Damaged', room=self.south)
+        self.old = DamageReport.objects.create(room=self.north, asset_type='Bed', description='Old')
+        self.new = DamageReport.objects.create(room=self.south, asset_type='Fan', description='New', status='Fixed')
+        DamageReport.objects.filter(pk=self.old.pk).update(reported_at=timezone.now() - timedelta(days=10))
+
+    def ids(self, url, params):
+        response = self.client.get(url, {**params, 'paginate': 'false'})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {row['id'] for row in response.json()}
+
+    def test_each_filter(self):
+        cases = [
+            ('/api/assets/assets/', {'asset_type': 'Fan'}, {self.fan.pk}),
+            ('/api/assets/assets/', {'condition': 'Good'}, {self.bed.pk}),
+            ('/api/assets/assets/', {'room': self.north.pk}, {self.bed.pk}),
+            ('/api/assets/assets/', {'room_number': 'B2'}, {self.fan.pk}),
+            ('/api/assets/assets/', {'hostel_name': 'North'}, {self.bed.pk}),
+            ('/api/assets/assets/', {'floor': 2}, {self.fan.pk}),
+            ('/api/assets/damage-reports/', {'status': 'Fixed'}, {self.new.pk}),
+            ('/api/assets/damage-reports/', {'asset_type': 'Bed'}, {self.old.pk}),
+            ('/api/assets/damage-reports/', {'room': self.south.pk}, {self.new.pk}),
+            ('/api/assets/damage-reports/', {'room_number': 'A1'}, {self.old.pk}),
+            ('/api/assets/damage-reports/', {'hostel_name': 'South'}, {self.new.pk}),
+            ('/api/rooms/', {'hostel_name': 'South'}, {self.south.pk}),
+            ('/api/rooms/', {'floor': 1}, {self.north.pk}),
+        ]
+        for url, params, expected in cases:
+            with self.subTest(url=url, params=params):
+                self.assertEqual(self.ids(url, params), expected)
+
+    def test_reported_date_range(self):
+        url = '/api/assets/damage-reports/'
+        cutoff = (timezone.now() - timedelta(days=5)).isoformat()
+        self.assertEqual(self.ids(url, {'reported_after': cutoff}), {self.new.pk})
+        self.assertEqual(self.ids(url, {'reported_before': cutoff}), {self.old.pk})
+        # A bare date is midnight in the current time zone
+        today = timezone.localdate().isoformat()
+        self.assertEqual(self.ids(url, {'reported_after': today}), {self.new.pk})
+
+    def test_bad_values_are_400(self):
+        for url, params in [('/api/assets/assets/', {'floor': 'x'}), ('/api/assets/assets/', {'room': 'abc'}),
+                            ('/api/assets/damage-reports/', {'reported_after': 'last week'})]:
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
+
+
+@override_settings(SESSION_REFRESH_INTERVAL=300)
+class SessionRefreshTests(TestCase):
+
+    def setUp(self):
+        self.started = 1_700_000_000
+        session = self.client.session
+        session['user_id'] = 1
+        session[sessions.REFRESHED_KEY] = self.started
+        session.save()
+        self.key = session.session_key
+        Session.objects.filter(pk=self.key).update(expire_date=timezone.now() + timedelta(hours=1))
+
+    def get_at(self, seconds_later):
+        with mock.patch.object(sessions.time, 'time', return_value=self.started + seconds_later):
+            return self.client.get('/api/health/')
+
+    def expires_in(self):
+        return Session.objects.get(pk=self.key).expire_date - timezone.now()
+
+    def test_no_write_inside_the_interval(self):
+        response = self.get_at(299)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertLess(self.expires_in(), timedelta(hours=2))
+
+    def test_refreshed_to_the_full_age_after_it(self):
+        response = self.get_at(300)
+        cookie = response.cookies[settings.SESSION_COOKIE_NAME]
+        self.assertEqual(cookie.value, self.key)
+        self.assertEqual(cookie['max-age'], settings.SESSION_COOKIE_AGE)
+        self.assertEqual(settings.SESSION_COOKIE_AGE, 86400)
+        self.assertGreater(self.expires_in(), timedelta(hours=23, minutes=59))
+        # The next refresh is a full interval away again
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.get_at(599).cookies)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """The pooled SQLite engine, on a throwaway file."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'hostel_inventory.db.sqlite3',
+            'NAME': f'{directory.name}/pool.sqlite3',
+            'POOL': {'MAX_SIZE': 1, 'TIMEOUT': 0.05},
+        }
+        self.alias = f'pool-test-{self.id()}'
+        self.addCleanup(dbpool._pools.pop, self.alias, None)
+        self.addCleanup(dbpool.close_idle)
+
+    def wrapper(self):
+        wrapper = PooledSQLiteWrapper(self.settings_dict, alias=self.alias)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def stats(self):
+        return dbpool.pool_stats()[self.alias]
+
+    def test_closed_connection_is_reused(self):
+        first = self.wrapper()
+        first.ensure_connection()
+        raw = first.connection
+        self.assertEqual((self.stats()['in_use'], self.stats()['idle']), (1, 0))
+        first.close()
+        self.assertEqual((self.stats()['in_use'], self.stats()['idle']), (0, 1))
+
+        second = self.wrapper()
+        with second.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIs(second.connection, raw)
+        self.assertTrue(second.pool_reused)
+        self.assertEqual((self.stats()['created'], self.stats()['reused']), (1, 1))
+
+    def test_full_pool_times_out(self):
+        self.wrapper().ensure_connection()
+        with self.assertRaises(OperationalError):
+            self.wrapper().ensure_connection()
+        self.assertEqual(self.stats()['timeouts'], 1)
+
+
+class EventHubTests(TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def subscribe(self, hub, **filters):
+        async def subscribe():
+            return hub.subscribe(**filters)
+
+        subscription = self.loop.run_until_complete(subscribe())
+        self.addCleanup(hub.unsubscribe, subscription)
+        return subscription
+
+    def received(self, subscription):
+        # Let the loop run the offers publish() scheduled on it
+        self.loop.run_until_complete(asyncio.sleep(0))
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+        return [(event['topic'], event['action'], event.get('hostel_name')) for event in events]
+
+    def test_filters(self):
+        hub = events.EventHub()
+        assets = self.subscribe(hub, topics={'asset'})
+        north = self.subscribe(hub, hostel_name='North')
+        for event in [{'topic': 'asset', 'action': 'created', 'hostel_name': 'North'},
+                      {'topic': 'damage_report', 'action': 'updated', 'hostel_name': 'South'},
+                      {'topic': 'damage_report', 'action': 'bulk'}]:
+            hub.publish(event)
+        self.assertEqual(self.received(assets), [('asset', 'created', 'North')])
+        # Bulk events carry no hostel, so every hostel filter gets them
+        self.assertEqual(self.received(north), [('asset', 'created', 'North'), ('damage_report', 'bulk', None)])
+
+    def test_published_only_after_commit(self):
+        subscription = self.subscribe(events.hub, topics={'asset'})
+        room = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Asset.objects.create(name='Bed 1', asset_type='Bed', room=room)
+        self.assertEqual(self.received(subscription), [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.received(subscription), [('asset', 'created', 'North')])
+
+    def test_slow_subscriber_drops_events_and_is_told_to_resync(self):
+        hub = events.EventHub()
+        with mock.patch.object(events, 'QUEUE_SIZE', 2):
+            subscription = self.subscribe(hub)
+        for action in ('created', 'updated', 'deleted'):
+            hub.publish({'topic': 'asset', 'action': action})
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(subscription.queue.qsize(), 2)
+        self.assertTrue(subscription.overflowed)
+
+        stream = events.event_stream(subscription)
+        messages = [self.loop.run_until_complete(stream.__anext__()) for _ in range(3)]
+        self.loop.run_until_complete(stream.aclose())
+        self.assertEqual(messages[1], 'event: resync\ndata: {}\n\n')
+        self.assertIn('event: asset.created', messages[2])
@@ -1,8 +1,11 @@
 from django.urls import path, include
+from . import views
 
 urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/assets/', include('assets.urls')),
     path('api/rooms/', include('rooms.urls')),
     path('api/dashboard/', include('dashboard.urls')),
+    path('api/health/', views.health_view, name='health'),
+    path('api/metrics/', views.metrics_view, name='metrics'),
 ]
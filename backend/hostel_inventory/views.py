@@ -0,0 +1,31 @@
+import logging
+
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, JsonResponse
+from . import metrics
+from .dbpool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+def health_view(request):
+    """Database round trip plus connection pool statistics for load balancers and dashboards."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        database = 'ok'
+    except DatabaseError:
+        # The message can name hosts and users; it goes to the log only
+        logger.exception('Health check query failed')
+        database = 'error'
+    return JsonResponse(
+        {'database': database, 'pools': pool_stats()},
+        status=200 if database == 'ok' else 503,
+    )
+
+
+def metrics_view(request):
+    """Per-view request metrics for this process, for Prometheus to scrape."""
+    if not metrics.allowed(request):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
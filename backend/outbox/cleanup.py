@@ -0,0 +1,33 @@
+"""
+Outbox Retention
+================
+
+Sent and failed emails are kept for ``OUTBOX_RETENTION_DAYS`` after their
+last attempt (for looking into delivery problems), then deleted in batches
+by the ``cleanup_expired`` command. Pending emails are never deleted.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from users.cleanup import BATCH_SIZE, PAUSE_SECONDS, in_batches
+from .models import OutboxEmail
+
+DEFAULT_RETENTION_DAYS = 30
+FINISHED_STATUSES = ('Sent', 'Failed')
+
+
+def delete_finished_emails(batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    days = getattr(settings, 'OUTBOX_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    # One status at a time, so each batch is a range scan on (status, next_attempt_at)
+    for status in FINISHED_STATUSES:
+        total += in_batches(
+            lambda size: OutboxEmail.objects.filter(status=status, next_attempt_at__lt=cutoff)
+            .order_by('next_attempt_at').values_list('id', flat=True)[:size],
+            lambda ids: OutboxEmail.objects.filter(id__in=ids).delete(),
+            batch_size, pause,
+        )
+    return total
@@ -0,0 +1,113 @@
+"""
+Email Outbox
+============
+
+Views call ``enqueue`` and return at once; the ``send_outbox`` worker claims
+due rows in batches and sends each batch over a single connection from
+EMAIL_BACKEND (one SMTP handshake per batch instead of per email). Failed
+sends are retried with exponential backoff and given up on after
+``MAX_ATTEMPTS``.
+
+A claim is just ``next_attempt_at`` pushed ``CLAIM_SECONDS`` into the
+future, so a worker that dies mid-batch leaves its rows to be picked up
+again once the claim runs out.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+CLAIM_SECONDS = 300
+RETRY_BASE_SECONDS = 30
+
+
+def enqueue(subject, body, recipient_list, from_email=None):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='Pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            OutboxEmail.objects.filter(id__in=[email.id for email in batch]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+            )
+    return batch
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def send_batch(batch, connection=None):
+    """Send ``batch`` over one connection; returns ``(sent, failed)`` counts."""
+    connection = connection or get_connection()
+    sent = []
+    failed = []
+    pending = iter(batch)
+    try:
+        connection.open()
+        for email in pending:
+            message = EmailMessage(email.subject, email.body, email.from_email, email.recipients,
+                                   connection=connection)
+            try:
+                message.send()
+            except Exception as e:
+                logger.warning('Sending outbox email %s failed: %s', email.id, e)
+                failed.append((email, str(e)))
+                # The server may have dropped us; carry on over a fresh connection
+                connection.close()
+                connection.open()
+            else:
+                sent.append(email)
+    except Exception as e:
+        logger.warning('Could not connect to the mail server: %s', e)
+        failed.extend((email, str(e)) for email in pending)
+    finally:
+        connection.close()
+
+    now = timezone.now()
+    if sent:
+        OutboxEmail.objects.filter(id__in=[email.id for email in sent]).update(
+            status='Sent', sent_at=now, last_error=''
+        )
+    for email, error in failed:
+        email.attempts += 1
+        email.last_error = error[:2000]
+        if email.attempts >= MAX_ATTEMPTS:
+            email.status = 'Failed'
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+        email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+    return len(sent), len(failed)
+
+
+def deliver_due(batch_size=BATCH_SIZE):
+    """Send everything that is due, one batch (and connection) at a time."""
+    total_sent = total_failed = 0
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return total_sent, total_failed
+        sent, failed = send_batch(batch)
+        total_sent += sent
+        total_failed += failed
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from outbox.delivery import BATCH_SIZE, deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails (runs continuously unless --once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Send what is due now and exit (e.g. from cron)')
+        parser.add_argument('--interval', type=float, default=2.0,
+                            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Emails sent per SMTP connection')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_due(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
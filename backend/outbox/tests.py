@@ -0,0 +1,57 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from . import delivery
+from .models import OutboxEmail
+
+
+class BrokenBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise OSError('Connection refused')
+
+
+class DeliveryTests(TestCase):
+
+    def setUp(self):
+        self.email = delivery.enqueue('Reset code', '123456', ['staff@example.com'])
+
+    def test_due_emails_are_sent_once(self):
+        self.assertEqual(delivery.deliver_due(), (1, 0))
+        self.assertEqual(delivery.deliver_due(), (0, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, 'Sent')
+
+    def test_failures_back_off_then_give_up(self):
+        for attempt in range(1, delivery.MAX_ATTEMPTS + 1):
+            batch = delivery.claim_batch()
+            self.assertEqual(len(batch), 1)
+            with self.assertLogs('outbox.delivery', 'WARNING'):
+                self.assertEqual(delivery.send_batch(batch, BrokenBackend()), (0, 1))
+            self.email.refresh_from_db()
+            self.assertEqual(self.email.attempts, attempt)
+            # Not due again until the backoff has passed
+            self.assertEqual(delivery.claim_batch(), [])
+            OutboxEmail.objects.filter(pk=self.email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(self.email.status, 'Failed')
+        self.assertEqual(self.email.last_error, 'Connection refused')
+        self.assertEqual(delivery.claim_batch(), [])
+
+
+class RetentionTests(TestCase):
+
+    def test_cleanup_deletes_old_finished_emails_only(self):
+        old = timezone.now() - timedelta(days=31)
+        for status in ('Sent', 'Failed', 'Pending'):
+            OutboxEmail.objects.create(subject=status, body='', from_email='a@example.com',
+                                       recipients=['b@example.com'], status=status, next_attempt_at=old)
+        OutboxEmail.objects.create(subject='Recent', body='', from_email='a@example.com',
+                                   recipients=['b@example.com'], status='Sent')
+        call_command('cleanup_expired', pause=0, stdout=StringIO())
+        self.assertEqual(sorted(OutboxEmail.objects.values_list('subject', flat=True)), ['Pending', 'Recent'])
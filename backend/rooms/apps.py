@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RoomsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rooms'
+
+    def ready(self):
+        from hostel_inventory.conditional import track_versions
+        track_versions(self.get_model('Room'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['hostel_name', 'room_number'], name='room_hostel_number_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_room_room_hostel_number_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['hostel_name', 'floor'], name='room_hostel_floor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['floor'], name='room_floor_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0003_room_room_hostel_floor_idx_room_room_floor_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['updated_at', 'id'], name='room_updated_id_idx'),
+        ),
+    ]
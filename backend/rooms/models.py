@@ -16,3 +16,9 @@ class Room(models.Model):
         verbose_name = "Room"
         verbose_name_plural = "Rooms"
         ordering = ['hostel_name', 'room_number']
+        indexes = [
+            models.Index(fields=['hostel_name', 'room_number'], name='room_hostel_number_idx'),
+            models.Index(fields=['hostel_name', 'floor'], name='room_hostel_floor_idx'),
+            models.Index(fields=['floor'], name='room_floor_idx'),
+            models.Index(fields=['updated_at', 'id'], name='room_updated_id_idx'),
+        ]
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from hostel_inventory.fields import SparseFieldsMixin
 from .models import Room
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     asset_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -14,4 +15,7 @@ class RoomSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_asset_count(self, obj):
+        # RoomViewSet annotates the count; fall back for freshly saved rooms
+        if hasattr(obj, 'asset_count'):
+            return obj.asset_count
         return obj.assets.count()
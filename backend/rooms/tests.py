@@ -0,0 +1,64 @@
+import io
+from unittest import mock
+
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import TestCase
+from hostel_inventory.importer import CsvImporter, RoomImporter
+from hostel_inventory.signals import rows_changed
+from .models import Room
+
+
+class SparseFieldsTests(TestCase):
+
+    def setUp(self):
+        self.room = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+
+    def test_only_requested_fields(self):
+        response = self.client.get(f'/api/rooms/{self.room.pk}/?fields=id,room_number')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'id': self.room.pk, 'room_number': 'A1'})
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/rooms/?fields=id,colour,size')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'fields': ['Unknown fields: colour, size']})
+
+
+class RoomImportTests(TestCase):
+
+    def test_importer_must_implement_clean_row_and_write(self):
+        class Partial(CsvImporter):
+            def clean_row(self, row):
+                return row, None
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_upserts_report_created_and_updated_rows(self):
+        existing = Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        sent = []
+
+        def receiver(sender, **kwargs):
+            sent.append(kwargs)
+
+        rows_changed.connect(receiver, sender=Room)
+        try:
+            summary = RoomImporter().run(io.StringIO('room_number,hostel_name,floor\nA1,South,2\nB1,South,\nC1,,\n'))
+        finally:
+            rows_changed.disconnect(receiver, sender=Room)
+
+        self.assertEqual((summary['written'], summary['error_count']), (2, 1))
+        [created] = sent[0]['created']
+        self.assertEqual((created.pk, created.room_number), (Room.objects.get(room_number='B1').pk, 'B1'))
+        [(before, after)] = sent[0]['updated']
+        self.assertEqual((before.pk, before.hostel_name), (existing.pk, 'North'))
+        self.assertEqual((after.pk, after.hostel_name, after.floor), (existing.pk, 'South', 2))
+
+    def test_upsert_names_its_conflict_target_only_where_supported(self):
+        Room.objects.create(room_number='A1', hostel_name='North', floor=1)
+        with mock.patch.object(QuerySet, 'bulk_create') as bulk_create, \
+                mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            RoomImporter().run(io.StringIO('room_number,hostel_name\nA1,South\n'))
+        self.assertTrue(bulk_create.call_args.kwargs['update_conflicts'])
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
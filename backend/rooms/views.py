@@ -1,12 +1,34 @@
+from django.db.models import Count
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
+from assets.models import Asset
+from hostel_inventory.conditional import ConditionalGetMixin
+from hostel_inventory.fastread import FastReadMixin
+from hostel_inventory.fields import SparseFieldsFilter
+from hostel_inventory.filters import FieldFilterBackend
+from hostel_inventory.importer import CsvImportMixin, RoomImporter
+from hostel_inventory.pagination import KeysetPagination
+from hostel_inventory.renderers import LIST_RENDERERS
+from sync.mixins import SyncMixin
 from .models import Room
 from .serializers import RoomSerializer
 
 
-class RoomViewSet(viewsets.ModelViewSet):
-    queryset = Room.objects.all()
+class RoomViewSet(ConditionalGetMixin, FastReadMixin, SyncMixin, CsvImportMixin, viewsets.ModelViewSet):
+    queryset = Room.objects.annotate(asset_count=Count('assets'))
     serializer_class = RoomSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    renderer_classes = LIST_RENDERERS
+    filter_backends = [FieldFilterBackend, OrderingFilter, SparseFieldsFilter]
+    filter_fields = {
+        'hostel_name': 'hostel_name',
+        'floor': 'floor',
+    }
+    ordering_fields = ['hostel_name', 'room_number', 'capacity', 'created_at']
+    fast_method_fields = {'asset_count': 'asset_count'}
+    etag_models = [Room, Asset]
+    importer_class = RoomImporter
@@ -0,0 +1,34 @@
+"""
+Tombstone Retention
+===================
+
+Tombstones older than ``SYNC_TOMBSTONE_RETENTION_DAYS`` are deleted in
+batches by the ``cleanup_expired`` command. A client whose ``updated_since``
+is older than that can no longer be told about every delete, so the sync
+endpoint answers 410 and it has to start again from a full snapshot.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from users.cleanup import BATCH_SIZE, PAUSE_SECONDS, in_batches
+from .models import Tombstone
+
+DEFAULT_RETENTION_DAYS = 30
+
+
+def retention_cutoff():
+    days = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return timezone.now() - timedelta(days=days)
+
+
+def prune_tombstones(batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    cutoff = retention_cutoff()
+    # Ids grow with deleted_at, so the oldest tombstones are at the start of the primary key
+    return in_batches(
+        lambda size: Tombstone.objects.filter(deleted_at__lt=cutoff)
+        .order_by('id').values_list('id', flat=True)[:size],
+        lambda ids: Tombstone.objects.filter(id__in=ids).delete(),
+        batch_size, pause,
+    )
@@ -0,0 +1,68 @@
+"""
+Delta Sync
+==========
+
+Viewset mixin adding ``GET <prefix>/sync/?updated_since=<token>``. It returns
+rows changed since the token (oldest first, keyset-paginated on
+``updated_at``), ids deleted since the token, and a ``sync_token`` for the
+next call. Without ``updated_since`` it returns a full snapshot. A token
+older than the tombstone retention (``SYNC_TOMBSTONE_RETENTION_DAYS``) gets
+410 Gone: the deletes since then may already be forgotten.
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .cleanup import retention_cutoff
+from .models import Tombstone
+
+# Re-read a short window before the token so rows written by transactions
+# that committed just after the previous sync are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class SyncMixin:
+
+    @action(detail=False, methods=['get'], url_path='sync')
+    def sync(self, request):
+        sync_token = timezone.now()
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+
+        since = None
+        raw_since = request.query_params.get('updated_since')
+        if raw_since:
+            since = parse_datetime(raw_since)
+            if since is None:
+                return Response({'error': 'updated_since must be an ISO 8601 datetime'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            if since < retention_cutoff():
+                return Response({'error': 'updated_since is older than the sync history; fetch a full snapshot'},
+                                status=status.HTTP_410_GONE)
+            queryset = queryset.filter(updated_at__gte=since - SYNC_OVERLAP)
+
+        queryset = queryset.order_by('updated_at', 'pk')
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = {
+            'changed': self.get_serializer(rows, many=True).data,
+            'deleted': [],
+            'next': self.paginator.get_next_link() if page is not None else None,
+            'sync_token': sync_token.isoformat(),
+        }
+
+        # Tombstones go out once, with the first page
+        if since is not None and not request.query_params.get(self.paginator.cursor_query_param):
+            data['deleted'] = list(
+                Tombstone.objects.filter(
+                    model=model._meta.label_lower,
+                    deleted_at__gte=since - SYNC_OVERLAP,
+                ).values_list('object_id', flat=True)
+            )
+        return Response(data)
@@ -0,0 +1,82 @@
+"""
+Keeps ``updated_at`` meaningful for delta sync: deletes leave a tombstone,
+and rows whose serialized form depends on another row (a room's asset count,
+an asset's room number) are touched when that other row changes.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from assets.models import Asset, DamageReport
+from hostel_inventory.signals import deleted_in_bulk, rows_changed, track_previous
+from rooms.models import Room
+from .models import Tombstone
+
+SYNCED_MODELS = (Asset, DamageReport, Room)
+
+track_previous(Asset)
+track_previous(Room)
+
+
+def touch_rooms(room_ids):
+    room_ids = {room_id for room_id in room_ids if room_id}
+    if room_ids:
+        Room.objects.filter(id__in=room_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_delete)
+def record_tombstone(sender, instance, **kwargs):
+    if sender in SYNCED_MODELS and not deleted_in_bulk(sender):
+        Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+@receiver(rows_changed)
+def record_bulk_tombstones(sender, deleted=None, **kwargs):
+    if sender in SYNCED_MODELS and deleted:
+        Tombstone.objects.bulk_create(
+            [Tombstone(model=sender._meta.label_lower, object_id=obj.pk) for obj in deleted]
+        )
+
+
+@receiver(post_save, sender=Asset)
+def touch_asset_rooms(sender, instance, created, **kwargs):
+    # RoomSerializer.asset_count changes when an asset arrives or leaves
+    previous = getattr(instance, '_previous', None)
+    old_room_id = previous.room_id if previous else None
+    if created or old_room_id != instance.room_id:
+        touch_rooms([old_room_id, instance.room_id])
+
+
+@receiver(post_delete, sender=Asset)
+def touch_deleted_asset_room(sender, instance, **kwargs):
+    if not deleted_in_bulk(sender):
+        touch_rooms([instance.room_id])
+
+
+@receiver(rows_changed, sender=Asset)
+def touch_bulk_asset_rooms(sender, created=None, updated=None, deleted=None, **kwargs):
+    if created is None and updated is None and deleted is None:
+        # Nothing says which rooms were affected
+        Room.objects.update(updated_at=timezone.now())
+        return
+    room_ids = [obj.room_id for obj in [*(created or ()), *(deleted or ())]]
+    for before, after in updated or ():
+        if before.room_id != after.room_id:
+            room_ids += [before.room_id, after.room_id]
+    touch_rooms(room_ids)
+
+
+@receiver(post_save, sender=Room)
+def touch_room_rows(sender, instance, created, **kwargs):
+    # Assets and reports serialize the room number
+    previous = getattr(instance, '_previous', None)
+    if previous and previous.room_number != instance.room_number:
+        now = timezone.now()
+        Asset.objects.filter(room=instance).update(updated_at=now)
+        DamageReport.objects.filter(room=instance).update(updated_at=now)
+
+
+@receiver(pre_delete, sender=Room)
+def touch_orphaned_assets(sender, instance, **kwargs):
+    # Assets are kept with room set to NULL by a plain UPDATE
+    Asset.objects.filter(room=instance).update(updated_at=timezone.now())
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from assets.models import Asset
+from rooms.models import Room
+from .models import Tombstone
+
+
+class BulkTouchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.rooms = [Room.objects.create(room_number=f'R{i}', hostel_name='North', floor=1) for i in range(3)]
+        self.asset = Asset.objects.create(name='Bed 1', asset_type='Bed', room=self.rooms[0])
+        self.long_ago = timezone.now() - timedelta(days=1)
+        Room.objects.update(updated_at=self.long_ago)
+
+    def touched(self):
+        return set(Room.objects.filter(updated_at__gt=self.long_ago).values_list('room_number', flat=True))
+
+    def test_bulk_move_touches_only_the_two_rooms(self):
+        response = self.client.patch('/api/assets/assets/bulk/', [{'id': self.asset.pk, 'room': self.rooms[1].pk}],
+                                     format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.touched(), {'R0', 'R1'})
+
+    def test_bulk_edit_in_place_touches_no_room(self):
+        self.client.patch('/api/assets/assets/bulk/', [{'id': self.asset.pk, 'condition': 'Damaged'}], format='json')
+        self.assertEqual(self.touched(), set())
+
+    def test_bulk_create_touches_the_new_assets_rooms(self):
+        self.client.post('/api/assets/assets/bulk/', [{'name': 'Fan', 'asset_type': 'Fan', 'room': self.rooms[2].pk}],
+                         format='json')
+        self.assertEqual(self.touched(), {'R2'})
+
+    def bulk_delete(self, count):
+        ids = [Asset.objects.create(name=f'Fan {i}', asset_type='Fan', room=self.rooms[i % 3]).pk
+               for i in range(count)]
+        Room.objects.update(updated_at=self.long_ago)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete('/api/assets/assets/bulk/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Tombstone.objects.filter(object_id__in=ids).count(), count)
+        return len(queries)
+
+    def test_bulk_delete_is_grouped(self):
+        few = self.bulk_delete(3)
+        self.assertEqual(self.touched(), {'R0', 'R1', 'R2'})
+        self.assertEqual(self.bulk_delete(30), few)
+
+
+@override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+class TombstoneRetentionTests(TestCase):
+
+    def test_cleanup_prunes_old_tombstones(self):
+        old = Tombstone.objects.create(model='assets.asset', object_id=1)
+        Tombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=31))
+        recent = Tombstone.objects.create(model='assets.asset', object_id=2)
+        call_command('cleanup_expired', pause=0, stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('pk', flat=True)), [recent.pk])
+
+    def test_tokens_older_than_retention_are_gone(self):
+        since = (timezone.now() - timedelta(days=31)).isoformat()
+        response = self.client.get('/api/assets/assets/sync/', {'updated_since': since})
+        self.assertEqual(response.status_code, 410)
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertEqual(self.client.get('/api/assets/assets/sync/', {'updated_since': since}).status_code, 200)
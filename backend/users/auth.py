@@ -0,0 +1,184 @@
+"""
+Session Users
+=============
+
+Resolves the logged-in user from the session once per request. The
+id -> (role, username) mapping is cached and dropped whenever the
+UserProfile row is saved or deleted, so role checks on read-only requests
+cost no query once the cache is warm. Requests that write (anything but
+GET, HEAD and OPTIONS) always re-read the role from the database.
+"""
+
+import functools
+import time
+from asyncio import iscoroutinefunction
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+from rest_framework.response import Response
+from hostel_inventory.asyncviews import session_get
+from hostel_inventory.signals import rows_changed
+from .models import UserProfile
+
+# Bulk writes that don't say which users changed bump the generation instead
+GENERATION_KEY = 'user-role:generation'
+ROLE_CACHE_KEY = 'user-role:{}:{}'
+ROLE_CACHE_TIMEOUT = 10
+
+
+class SessionUser:
+    """The cached part of a UserProfile; fetch the row itself when more is needed."""
+    is_authenticated = True
+
+    def __init__(self, id, role, username):
+        self.id = id
+        self.role = role
+        self.username = username
+
+    @property
+    def pk(self):
+        return self.id
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+async def aget_generation():
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def get_session_user(user_id, fresh=False):
+    """``fresh`` skips the cached role (and refreshes it)."""
+    key = ROLE_CACHE_KEY.format(get_generation(), user_id)
+    cached = None if fresh else cache.get(key)
+    if cached is None:
+        cached = UserProfile.objects.filter(id=user_id).values_list('role', 'username').first()
+        if cached is None:
+            return None
+        cache.set(key, cached, ROLE_CACHE_TIMEOUT)
+    return SessionUser(user_id, *cached)
+
+
+async def aget_session_user(user_id, fresh=False):
+    key = ROLE_CACHE_KEY.format(await aget_generation(), user_id)
+    cached = None if fresh else await cache.aget(key)
+    if cached is None:
+        cached = await UserProfile.objects.filter(id=user_id).values_list('role', 'username').afirst()
+        if cached is None:
+            return None
+        await cache.aset(key, cached, ROLE_CACHE_TIMEOUT)
+    return SessionUser(user_id, *cached)
+
+
+def forget_user(user_id):
+    cache.delete(ROLE_CACHE_KEY.format(get_generation(), user_id))
+
+
+def forget_all_users():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def track_user_roles():
+    def changed(sender, instance, **kwargs):
+        user_id = instance.pk
+        # Drop it now and again after commit, so a read in between can't re-cache the old role
+        forget_user(user_id)
+        transaction.on_commit(lambda: forget_user(user_id))
+
+    def bulk_changed(sender, created=None, **kwargs):
+        # New rows can't have a cached role yet
+        if not created:
+            forget_all_users()
+            transaction.on_commit(forget_all_users)
+
+    post_save.connect(changed, sender=UserProfile, dispatch_uid='user-role-save')
+    post_delete.connect(changed, sender=UserProfile, dispatch_uid='user-role-delete')
+    rows_changed.connect(bulk_changed, sender=UserProfile, dispatch_uid='user-role-bulk')
+
+
+class SessionUserAuthentication(BaseAuthentication):
+    """
+    Sets ``request.user`` to a SessionUser (or None) from ``session['user_id']``.
+    Like the views before it, it does not enforce CSRF.
+    """
+
+    def authenticate(self, request):
+        user_id = request._request.session.get('user_id')
+        if not user_id:
+            return None
+        user = get_session_user(user_id, fresh=request.method not in SAFE_METHODS)
+        if user is None:
+            return None
+        return (user, None)
+
+    def authenticate_header(self, request):
+        # Lets DRF answer 401 rather than 403 when nobody is logged in
+        return 'Session'
+
+
+def role_error(user_id, user, roles, message):
+    if not user_id:
+        return {'error': 'Not logged in'}, status.HTTP_401_UNAUTHORIZED
+    if user is None:
+        return {'error': 'User not found'}, status.HTTP_401_UNAUTHORIZED
+    if roles and user.role not in roles:
+        return {'error': message or 'You do not have permission to do this'}, status.HTTP_403_FORBIDDEN
+    return None
+
+
+class HasRole(BasePermission):
+    """DRF counterpart of ``role_required`` for viewsets: ``required_roles = ['Warden']``."""
+    message = 'You do not have permission to do this'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if user is None:
+            return False
+        roles = getattr(view, 'required_roles', ())
+        return not roles or user.role in roles
+
+
+def role_required(*roles, message=None):
+    """
+    Require a logged-in user, and one of ``roles`` if any are given. Works on
+    ``@api_view`` functions (apply it below ``@api_view``) and on async views;
+    either way the view can use ``request.user`` afterwards.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                user_id = await session_get(request, 'user_id')
+                user = await aget_session_user(user_id, fresh=request.method not in SAFE_METHODS) if user_id else None
+                error = role_error(user_id, user, roles, message)
+                if error:
+                    return JsonResponse(error[0], status=error[1])
+                request.user = user
+                return await view(request, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            error = role_error(request.session.get('user_id'), request.user, roles, message)
+            if error:
+                return Response(error[0], status=error[1])
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
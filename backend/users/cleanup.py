@@ -0,0 +1,53 @@
+"""
+Expired Data Cleanup
+====================
+
+Deletes expired sessions and clears expired password-reset codes a bounded
+batch at a time. Each batch picks its keys with an index range scan on the
+expiry column and is committed on its own, so locks stay short and live
+logins are never stuck behind one long DELETE.
+"""
+
+import time
+
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+from .models import UserProfile
+
+BATCH_SIZE = 1000
+PAUSE_SECONDS = 0.05
+
+
+def in_batches(next_keys, apply, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    """Call ``apply(keys)`` until ``next_keys(batch_size)`` comes back empty."""
+    total = 0
+    while True:
+        keys = list(next_keys(batch_size))
+        if not keys:
+            return total
+        apply(keys)
+        total += len(keys)
+        if len(keys) < batch_size:
+            return total
+        time.sleep(pause)
+
+
+def delete_expired_sessions(batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    now = timezone.now()
+    return in_batches(
+        lambda size: Session.objects.filter(expire_date__lt=now)
+        .order_by('expire_date').values_list('session_key', flat=True)[:size],
+        lambda keys: Session.objects.filter(session_key__in=keys).delete(),
+        batch_size, pause,
+    )
+
+
+def clear_expired_reset_codes(batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    now = timezone.now()
+    # A plain update on purpose: nothing cached depends on the reset columns
+    return in_batches(
+        lambda size: UserProfile.objects.filter(reset_code_expires__lt=now)
+        .order_by('reset_code_expires').values_list('id', flat=True)[:size],
+        lambda ids: UserProfile.objects.filter(id__in=ids).update(reset_code=None, reset_code_expires=None),
+        batch_size, pause,
+    )
@@ -0,0 +1,165 @@
+"""
+Password Hashing Pool
+=====================
+
+PBKDF2 is deliberately slow, and a burst of logins used to run one hash per
+request thread, pinning every worker. Hashes now run on a small dedicated
+pool (hashlib releases the GIL, so they still use several cores) with a
+bounded backlog. When the backlog is full the request fails fast with a 503
+instead of queueing behind hundreds of others; cheap requests keep their
+threads and CPU.
+
+Sizes come from ``PASSWORD_HASH_WORKERS`` and ``PASSWORD_HASH_QUEUE``.
+
+Bulk provisioning hashes many passwords at once through ``make_passwords``,
+on the same pool: it keeps at most one batch of ``workers`` hashes queued,
+waiting for free slots instead of failing, so sign-ins still get in while a
+large upload runs.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import SimpleRateThrottle
+
+# How long a bulk upload waits for a free slot before giving up
+BULK_WAIT_SECONDS = 30
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in requests right now, please retry in a few seconds.'
+    default_code = 'hashing_busy'
+
+
+class HashingPool:
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def submit(self, func, *args, timeout=None):
+        """
+        Queue ``func(*args)`` and return its future. Without ``timeout`` a full
+        backlog raises HashingBusy at once; with one, it waits that long.
+        """
+        acquired = self.slots.acquire(timeout=timeout) if timeout is not None else self.slots.acquire(blocking=False)
+        if not acquired:
+            with self.lock:
+                self.rejected += 1
+            raise HashingBusy()
+
+        submitted = time.perf_counter()
+        with self.lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        def task():
+            with self.lock:
+                self.running += 1
+                self.wait_seconds += time.perf_counter() - submitted
+            try:
+                return func(*args)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        def done(future):
+            with self.lock:
+                self.pending -= 1
+                self.completed += 1
+            self.slots.release()
+
+        try:
+            future = self.executor.submit(task)
+        except BaseException:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def run(self, func, *args):
+        return self.submit(func, *args).result()
+
+    def map(self, func, items, timeout=BULK_WAIT_SECONDS):
+        """``[func(item) for item in items]``, ``workers`` at a time, in order."""
+        items = list(items)
+        results = []
+        for start in range(0, len(items), self.workers):
+            futures = [self.submit(func, item, timeout=timeout) for item in items[start:start + self.workers]]
+            results.extend(future.result() for future in futures)
+        return results
+
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'running': self.running,
+                'queued': self.pending - self.running,
+                'peak_pending': self.peak_pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = getattr(settings, 'PASSWORD_HASH_WORKERS', None) or max(1, (os.cpu_count() or 2) // 2)
+                _pool = HashingPool(workers, getattr(settings, 'PASSWORD_HASH_QUEUE', 32))
+    return _pool
+
+
+def make_password(raw_password):
+    return get_pool().run(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded):
+    return get_pool().run(hashers.check_password, raw_password, encoded)
+
+
+def make_passwords(raw_passwords):
+    """Hash a list of passwords in parallel on the hashing pool, keeping order."""
+    return get_pool().map(hashers.make_password, raw_passwords)
+
+
+class PasswordIPThrottle(SimpleRateThrottle):
+    """Requests that hash a password, per client IP."""
+    scope = 'password-ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class PasswordAccountThrottle(SimpleRateThrottle):
+    """Requests that hash a password, per username (or email on the reset flow)."""
+    scope = 'password-account'
+
+    def get_cache_key(self, request, view):
+        account = request.data.get('username') or request.data.get('email')
+        if not account or not isinstance(account, str):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': account.strip().lower()}
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from outbox.cleanup import delete_finished_emails
+from sync.cleanup import prune_tombstones
+from users.cleanup import BATCH_SIZE, PAUSE_SECONDS, clear_expired_reset_codes, delete_expired_sessions
+
+
+class Command(BaseCommand):
+    help = ('Delete expired sessions, clear expired password reset codes, and prune old sync tombstones '
+            'and delivered or failed outbox emails, in small batches')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=PAUSE_SECONDS,
+                            help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        sessions = delete_expired_sessions(options['batch_size'], options['pause'])
+        codes = clear_expired_reset_codes(options['batch_size'], options['pause'])
+        tombstones = prune_tombstones(options['batch_size'], options['pause'])
+        emails = delete_finished_emails(options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {sessions} expired sessions, cleared {codes} expired reset codes, '
+            f'pruned {tombstones} sync tombstones and {emails} finished outbox emails'
+        ))
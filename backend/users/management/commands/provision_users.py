@@ -0,0 +1,31 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from users.provisioning import provision_users, read_csv
+
+
+class Command(BaseCommand):
+    help = 'Create user accounts in bulk from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV with username,email,password[,role,...] columns, or a JSON list')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                if path.endswith('.json'):
+                    summary = provision_users(json.load(f))
+                else:
+                    summary = provision_users(read_csv(f), first_line=2)
+        except (OSError, ValueError, csv.Error) as e:
+            raise CommandError(str(e))
+
+        for result in summary['results']:
+            if result['status'] == 'error':
+                where = f"Row {result['row']}" if 'row' in result else f"Item {result['index']}"
+                self.stderr.write(f"{where} ({result['username']}): {result['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {summary['created']} users ({summary['failed']} rejected)"
+        ))
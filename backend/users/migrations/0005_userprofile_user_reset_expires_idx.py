@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_userprofile_user_email_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['reset_code_expires'], name='user_reset_expires_idx'),
+        ),
+    ]
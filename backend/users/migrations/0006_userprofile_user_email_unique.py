@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:13
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_emails(apps, schema_editor):
+    UserProfile = apps.get_model('users', 'UserProfile')
+    duplicates = list(
+        UserProfile.objects.values('email').annotate(accounts=Count('id')).filter(accounts__gt=1)
+        .values_list('email', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Several accounts share these emails; give each account its own email, '
+            f'then run migrate again: {", ".join(duplicates)}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_userprofile_user_reset_expires_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userprofile',
+            constraint=models.UniqueConstraint(fields=('email',), name='user_email_unique'),
+        ),
+        # The constraint's index serves the email lookups now
+        migrations.RemoveIndex(
+            model_name='userprofile',
+            name='user_email_idx',
+        ),
+    ]
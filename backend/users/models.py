@@ -1,7 +1,7 @@
 from django.db import models
-from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from datetime import timedelta
+from .hashing import make_password, check_password
 import random
 import string
 
@@ -58,3 +58,14 @@ class UserProfile(models.Model):
     class Meta:
         verbose_name = "User Profile"
         verbose_name_plural = "User Profiles"
+        # The views check for clashes first to give a friendly error; the
+        # constraint catches the races between check and write
+        constraints = [
+            models.UniqueConstraint(fields=['email'], name='user_email_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['role', 'username'], name='user_role_username_idx'),
+            models.Index(fields=['first_name'], name='user_first_name_idx'),
+            models.Index(fields=['last_name'], name='user_last_name_idx'),
+            models.Index(fields=['reset_code_expires'], name='user_reset_expires_idx'),
+        ]
@@ -0,0 +1,169 @@
+"""
+Bulk User Provisioning
+======================
+
+Creates many staff accounts in one go from a list of dicts or a CSV file.
+Rows are validated first, username/email clashes with existing accounts are
+found with a single query, the surviving passwords are hashed in parallel
+on the hashing pool, and the accounts are inserted with one ``bulk_create``.
+Bad rows never block good ones; every row gets its own result. If accounts
+with the same usernames or emails keep appearing while the upload is being
+inserted, ProvisioningConflict is raised and nothing is created.
+"""
+
+import csv
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from hostel_inventory.importer import open_text
+from hostel_inventory.signals import rows_changed
+from .hashing import make_passwords
+from .models import UserProfile
+
+MAX_ROWS = 1000
+DEFAULT_ROLE = 'Inventory Staff'
+ROLES = {value for value, _ in UserProfile.ROLE_CHOICES}
+TEXT_FIELDS = ['first_name', 'last_name', 'phone_number']
+CSV_COLUMNS = ['username', 'email', 'password']
+
+
+class ProvisioningConflict(Exception):
+    """The insert still clashed after re-checking; ``usernames`` are the rows involved."""
+
+    def __init__(self, usernames):
+        super().__init__(f'Accounts created concurrently clash with: {", ".join(usernames)}')
+        self.usernames = usernames
+
+
+def read_csv(file):
+    reader = csv.DictReader(open_text(file))
+    missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f'Missing columns: {", ".join(missing)}')
+    return [{key.strip(): (value or '').strip() for key, value in row.items() if key} for row in reader]
+
+
+def clean_row(row, seen_usernames, seen_emails):
+    errors = {}
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': 'Expected an object'}
+
+    username = str(row.get('username') or '').strip()
+    email = str(row.get('email') or '').strip()
+    password = row.get('password') or ''
+    role = row.get('role') or DEFAULT_ROLE
+    for field, value in (('username', username), ('email', email), ('password', password)):
+        if not value:
+            errors[field] = 'This field is required'
+    if role not in ROLES:
+        errors['role'] = f'"{role}" is not a valid role'
+    if username and username in seen_usernames:
+        errors['username'] = 'Duplicate username in this upload'
+    if email and email.lower() in seen_emails:
+        errors['email'] = 'Duplicate email in this upload'
+    seen_usernames.add(username)
+    seen_emails.add(email.lower())
+    if errors:
+        return None, errors
+
+    cleaned = {'username': username, 'email': email, 'password': str(password), 'role': role}
+    for field in TEXT_FIELDS:
+        value = row.get(field)
+        if value not in (None, ''):
+            cleaned[field] = str(value).strip()
+    return cleaned, None
+
+
+def find_conflicts(rows):
+    """One query for every username or email in ``rows`` that is already taken."""
+    taken = UserProfile.objects.filter(
+        Q(username__in=[row['username'] for row in rows]) | Q(email__in=[row['email'] for row in rows])
+    ).values_list('username', 'email')
+    usernames = set()
+    emails = set()
+    for username, email in taken:
+        usernames.add(username)
+        emails.add(email.lower())
+    return usernames, emails
+
+
+def provision_users(rows, first_line=None):
+    """
+    Returns ``{'created', 'failed', 'results'}`` where ``results`` holds one
+    entry per input row, in order: ``{'index', 'username', 'status', ...}``.
+    Pass ``first_line`` (2 for a CSV with a header) to also report file lines.
+    """
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f'At most {MAX_ROWS} users per upload')
+
+    results = []
+    valid = []
+    seen_usernames = set()
+    seen_emails = set()
+    for index, row in enumerate(rows):
+        cleaned, errors = clean_row(row, seen_usernames, seen_emails)
+        result = {'index': index, 'username': row.get('username') if isinstance(row, dict) else None}
+        if first_line is not None:
+            result['row'] = first_line + index
+        if errors:
+            result.update(status='error', errors=errors)
+        else:
+            valid.append((cleaned, result))
+        results.append(result)
+
+    if valid:
+        usernames, emails = find_conflicts([cleaned for cleaned, _ in valid])
+        valid = [(cleaned, result) for cleaned, result in valid
+                 if not reject_conflict(cleaned, result, usernames, emails)]
+
+    if valid:
+        hashes = make_passwords([cleaned['password'] for cleaned, _ in valid])
+        for (cleaned, _), hashed in zip(valid, hashes):
+            cleaned['password'] = hashed
+        insert(valid)
+
+    created = sum(1 for result in results if result['status'] == 'created')
+    return {'created': created, 'failed': len(results) - created, 'results': results}
+
+
+def reject_conflict(cleaned, result, usernames, emails):
+    errors = {}
+    if cleaned['username'] in usernames:
+        errors['username'] = 'Username already exists'
+    if cleaned['email'].lower() in emails:
+        errors['email'] = 'Email already in use'
+    if errors:
+        result.update(status='error', errors=errors)
+    return bool(errors)
+
+
+def insert(valid):
+    users = [UserProfile(**cleaned) for cleaned, _ in valid]
+    try:
+        with transaction.atomic():
+            UserProfile.objects.bulk_create(users)
+    except IntegrityError:
+        # Someone registered one of these usernames since the conflict check
+        usernames, emails = find_conflicts([cleaned for cleaned, _ in valid])
+        valid = [(cleaned, result) for cleaned, result in valid
+                 if not reject_conflict(cleaned, result, usernames, emails)]
+        users = [UserProfile(**cleaned) for cleaned, _ in valid]
+        try:
+            with transaction.atomic():
+                UserProfile.objects.bulk_create(users)
+        except IntegrityError:
+            # Another upload is racing this one; report the clashing rows rather than retry forever
+            usernames, emails = find_conflicts([cleaned for cleaned, _ in valid])
+            clashing = [cleaned['username'] for cleaned, _ in valid
+                        if cleaned['username'] in usernames or cleaned['email'].lower() in emails]
+            raise ProvisioningConflict(clashing or [cleaned['username'] for cleaned, _ in valid])
+
+    if users and users[0].pk is None:
+        # MySQL does not return ids from a bulk insert
+        ids = dict(UserProfile.objects.filter(username__in=[user.username for user in users])
+                   .values_list('username', 'id'))
+        for user in users:
+            user.pk = ids.get(user.username)
+    for user, (_, result) in zip(users, valid):
+        result.update(status='created', id=user.pk, role=user.role)
+    rows_changed.send(sender=UserProfile, created=users)
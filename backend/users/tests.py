@@ -0,0 +1,142 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models.query import QuerySet
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from . import cleanup
+from .hashing import HashingBusy, HashingPool
+from .models import UserProfile
+from .provisioning import ProvisioningConflict, provision_users
+
+
+class HashingPoolTests(SimpleTestCase):
+
+    def test_map_keeps_order_and_counts_tasks(self):
+        pool = HashingPool(workers=2, queue_size=0)
+        self.assertEqual(pool.map(str.upper, ['a', 'b', 'c', 'd', 'e']), ['A', 'B', 'C', 'D', 'E'])
+        stats = pool.stats()
+        self.assertEqual((stats['completed'], stats['running'], stats['queued']), (5, 0, 0))
+
+    def test_full_backlog_rejects_single_hashes(self):
+        pool = HashingPool(workers=1, queue_size=0)
+        release = threading.Event()
+        busy = pool.submit(release.wait)
+        with self.assertRaises(HashingBusy):
+            pool.run(str.upper, 'a')
+        release.set()
+        busy.result()
+        self.assertEqual(pool.run(str.upper, 'a'), 'A')
+        self.assertEqual(pool.stats()['rejected'], 1)
+
+
+class ProvisioningTests(TestCase):
+
+    def rows(self):
+        return [{'username': 'amina', 'email': 'amina@example.com', 'password': 'pw-123456'},
+                {'username': 'baraka', 'email': 'baraka@example.com', 'password': 'pw-123456'}]
+
+    def test_existing_accounts_are_reported_per_row(self):
+        UserProfile.objects.create(username='amina', email='other@example.com', password='x')
+        summary = provision_users(self.rows())
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(summary['results'][0]['errors'], {'username': 'Username already exists'})
+
+    def test_repeated_insert_conflict_raises(self):
+        with mock.patch.object(UserProfile.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(ProvisioningConflict) as raised:
+                provision_users(self.rows())
+        self.assertEqual(raised.exception.usernames, ['amina', 'baraka'])
+        self.assertFalse(UserProfile.objects.exists())
+
+
+class RoleRevocationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.warden = UserProfile.objects.create(username='warden', email='warden@example.com',
+                                                 password='x', role='Warden')
+        session = self.client.session
+        session['user_id'] = self.warden.pk
+        session.save()
+
+    def test_saved_role_change_applies_at_once(self):
+        self.assertEqual(self.client.get('/api/users/list/').status_code, 200)
+        self.warden.role = 'Inventory Staff'
+        self.warden.save()
+        self.assertEqual(self.client.get('/api/users/list/').status_code, 403)
+
+    def test_writes_ignore_a_stale_cached_role(self):
+        self.assertEqual(self.client.get('/api/users/list/').status_code, 200)
+        # As if another process demoted the Warden: this process's cache never hears of it
+        UserProfile.objects.filter(pk=self.warden.pk).update(role='Inventory Staff')
+        self.assertEqual(self.client.get('/api/users/list/').status_code, 200)
+        response = self.client.post('/api/users/bulk-create-users/', {'users': []}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get('/api/users/list/').status_code, 403)
+
+
+class UniqueEmailTests(TestCase):
+
+    def setUp(self):
+        UserProfile.objects.create(username='amina', email='amina@example.com', password='x', role='Warden')
+
+    def test_database_rejects_a_second_account(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserProfile.objects.create(username='other', email='amina@example.com', password='x')
+
+    def test_race_past_the_check_is_a_400(self):
+        # As if the other account was created between the view's check and its insert
+        with mock.patch.object(QuerySet, 'exists', return_value=False):
+            response = self.client.post('/api/users/register/', {
+                'username': 'other', 'email': 'amina@example.com', 'password': 'pw-123456',
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(UserProfile.objects.count(), 1)
+
+    def test_reset_code_flow(self):
+        response = self.client.post('/api/users/request-reset/', {'email': 'amina@example.com'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        code = UserProfile.objects.get().reset_code
+        data = {'email': 'amina@example.com', 'code': code}
+        self.assertEqual(self.client.post('/api/users/verify-code/', data,
+                                          content_type='application/json').status_code, 200)
+        response = self.client.post('/api/users/reset-password-with-code/', {**data, 'new_password': 'pw-654321'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(UserProfile.objects.get().reset_code)
+
+
+class CleanupTests(TestCase):
+
+    def setUp(self):
+        self.past = timezone.now() - timedelta(minutes=1)
+        self.future = timezone.now() + timedelta(hours=1)
+
+    def run_batched(self, clean):
+        with mock.patch.object(cleanup.time, 'sleep') as sleep:
+            total = clean(batch_size=2, pause=0.5)
+        # Batches of 2, 2 and 1, with a pause after each full one
+        self.assertEqual((total, sleep.call_count), (5, 2))
+
+    def test_expired_sessions_are_deleted_in_batches(self):
+        for i in range(5):
+            Session.objects.create(session_key=f'expired{i}', session_data='', expire_date=self.past)
+        Session.objects.create(session_key='live', session_data='', expire_date=self.future)
+        self.run_batched(cleanup.delete_expired_sessions)
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+    def test_expired_reset_codes_are_cleared_in_batches(self):
+        for i in range(5):
+            UserProfile.objects.create(username=f'user{i}', email=f'user{i}@example.com', password='x',
+                                       reset_code='123456', reset_code_expires=self.past)
+        live = UserProfile.objects.create(username='live', email='live@example.com', password='x',
+                                          reset_code='654321', reset_code_expires=self.future)
+        self.run_batched(cleanup.clear_expired_reset_codes)
+        self.assertEqual(list(UserProfile.objects.exclude(reset_code=None).values_list('id', flat=True)), [live.pk])
+        self.assertEqual(UserProfile.objects.filter(reset_code_expires__isnull=True).count(), 5)
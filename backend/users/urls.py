@@ -1,6 +1,10 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from . import views
 
+router = DefaultRouter()
+router.register(r'directory', views.UserDirectoryViewSet, basename='user-directory')
+
 urlpatterns = [
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
@@ -8,10 +12,12 @@ urlpatterns = [
     path('me/', views.current_user_view, name='current-user'),
     path('profile/update/', views.update_profile_view, name='update-profile'),
     path('create-user/', views.create_user_view, name='create-user'),
+    path('bulk-create-users/', views.bulk_create_users_view, name='bulk-create-users'),
     path('list/', views.list_users_view, name='list-users'),
     path('update-user/<int:user_id>/', views.update_user_view, name='update-user'),
     path('delete-user/<int:user_id>/', views.delete_user_view, name='delete-user'),
     path('request-reset/', views.request_password_reset_view, name='request-reset'),
     path('verify-code/', views.verify_reset_code_view, name='verify-code'),
     path('reset-password-with-code/', views.reset_password_with_code_view, name='reset-password-with-code'),
+    path('', include(router.urls)),
 ]
@@ -1,15 +1,24 @@
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import filters, status, viewsets
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from hostel_inventory.asyncviews import async_api_view, session_get
+from hostel_inventory.fastread import FastReadMixin
+from hostel_inventory.filters import FieldFilterBackend
+from hostel_inventory.pagination import KeysetPagination
+from outbox.delivery import enqueue
+from .auth import HasRole, role_required
+from .hashing import PasswordAccountThrottle, PasswordIPThrottle, make_password
 from .models import UserProfile
+from .provisioning import ProvisioningConflict, provision_users, read_csv
 from .serializers import UserProfileSerializer
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PasswordIPThrottle, PasswordAccountThrottle])
 def register_view(request):
     username = request.data.get('username')
     password = request.data.get('password')
@@ -25,18 +34,27 @@ def register_view(request):
         return Response({'error': 'Username already exists'}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
+    if UserProfile.objects.filter(email=email).exists():
+        return Response({'error': 'Email already in use'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
+    
     user_count = UserProfile.objects.count()
     role = 'Warden' if user_count == 0 else 'Pending'
     
-    user = UserProfile.objects.create(
-        username=username,
-        email=email,
-        first_name=first_name,
-        last_name=last_name,
-        role=role
-    )
-    user.set_password(password)
-    user.save()
+    try:
+        with transaction.atomic():
+            user = UserProfile.objects.create(
+                username=username,
+                password=make_password(password),
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                role=role
+            )
+    except IntegrityError:
+        # Taken by someone else since the checks above
+        return Response({'error': 'Username or email already in use'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
     
     return Response({
         'user': UserProfileSerializer(user).data,
@@ -46,6 +64,7 @@ def register_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PasswordIPThrottle, PasswordAccountThrottle])
 def login_view(request):
     username = request.data.get('username')
     password = request.data.get('password')
@@ -80,29 +99,25 @@ def logout_view(request):
     return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def current_user_view(request):
-    user_id = request.session.get('user_id')
+@async_api_view(['GET'])
+async def current_user_view(request):
+    user_id = await session_get(request, 'user_id')
     if not user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
+        return JsonResponse({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
     
     try:
-        user = UserProfile.objects.get(id=user_id)
-        return Response(UserProfileSerializer(user).data, status=status.HTTP_200_OK)
+        user = await UserProfile.objects.aget(id=user_id)
+        return JsonResponse(UserProfileSerializer(user).data, status=status.HTTP_200_OK)
     except UserProfile.DoesNotExist:
-        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
+        return JsonResponse({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
 @api_view(['PUT'])
 @permission_classes([AllowAny])
+@role_required()
 def update_profile_view(request):
-    user_id = request.session.get('user_id')
-    if not user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
-    
     try:
-        user = UserProfile.objects.get(id=user_id)
+        user = UserProfile.objects.get(id=request.user.id)
         user.first_name = request.data.get('first_name', user.first_name)
         user.last_name = request.data.get('last_name', user.last_name)
         user.phone_number = request.data.get('phone_number', user.phone_number)
@@ -118,19 +133,8 @@ def update_profile_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@role_required('Warden', message='Only Warden can create users')
 def create_user_view(request):
-    user_id = request.session.get('user_id')
-    if not user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
-    
-    try:
-        current_user = UserProfile.objects.get(id=user_id)
-        if current_user.role != 'Warden':
-            return Response({'error': 'Only Warden can create users'}, 
-                          status=status.HTTP_403_FORBIDDEN)
-    except UserProfile.DoesNotExist:
-        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
-    
     username = request.data.get('username')
     password = request.data.get('password')
     email = request.data.get('email')
@@ -146,15 +150,24 @@ def create_user_view(request):
         return Response({'error': 'Username already exists'}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
-    user = UserProfile.objects.create(
-        username=username,
-        email=email,
-        first_name=first_name,
-        last_name=last_name,
-        role=role
-    )
-    user.set_password(password)
-    user.save()
+    if UserProfile.objects.filter(email=email).exists():
+        return Response({'error': 'Email already in use'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        with transaction.atomic():
+            user = UserProfile.objects.create(
+                username=username,
+                password=make_password(password),
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                role=role
+            )
+    except IntegrityError:
+        # Taken by someone else since the checks above
+        return Response({'error': 'Username or email already in use'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
     
     return Response({
         'user': UserProfileSerializer(user).data,
@@ -162,40 +175,45 @@ def create_user_view(request):
     }, status=status.HTTP_201_CREATED)
 
 
-@api_view(['GET'])
+@api_view(['POST'])
 @permission_classes([AllowAny])
-def list_users_view(request):
-    user_id = request.session.get('user_id')
-    if not user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
-    
+@role_required('Warden', message='Only Warden can create users')
+def bulk_create_users_view(request):
+    """
+    Create many users at once from a JSON list (``{"users": [...]}`` or a bare
+    list) or a CSV upload in ``file`` with username, email and password
+    columns (role, first_name, last_name, phone_number optional).
+    """
     try:
-        current_user = UserProfile.objects.get(id=user_id)
-        if current_user.role != 'Warden':
-            return Response({'error': 'Only Warden can view all users'}, 
-                          status=status.HTTP_403_FORBIDDEN)
-    except UserProfile.DoesNotExist:
-        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
+        if 'file' in request.FILES:
+            summary = provision_users(read_csv(request.FILES['file']), first_line=2)
+        else:
+            rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+            if not isinstance(rows, list):
+                return Response({'error': 'Send a list of users or a CSV file'}, 
+                               status=status.HTTP_400_BAD_REQUEST)
+            summary = provision_users(rows)
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ProvisioningConflict as e:
+        return Response({'error': 'Some of these accounts were created by someone else meanwhile; '
+                                  'nothing was created', 'usernames': e.usernames},
+                        status=status.HTTP_409_CONFLICT)
     
-    users = UserProfile.objects.all()
-    return Response(UserProfileSerializer(users, many=True).data, status=status.HTTP_200_OK)
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['GET'])
+@role_required('Warden', message='Only Warden can view all users')
+async def list_users_view(request):
+    users = [user async for user in UserProfile.objects.all()]
+    return JsonResponse(UserProfileSerializer(users, many=True).data, safe=False, status=status.HTTP_200_OK)
 
 
 @api_view(['PUT'])
 @permission_classes([AllowAny])
+@role_required('Warden', message='Only Warden can update other users')
 def update_user_view(request, user_id):
-    current_user_id = request.session.get('user_id')
-    if not current_user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
-    
-    try:
-        current_user = UserProfile.objects.get(id=current_user_id)
-        if current_user.role != 'Warden':
-            return Response({'error': 'Only Warden can update other users'}, 
-                          status=status.HTTP_403_FORBIDDEN)
-    except UserProfile.DoesNotExist:
-        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
-    
     try:
         target_user = UserProfile.objects.get(id=user_id)
     except UserProfile.DoesNotExist:
@@ -206,6 +224,9 @@ def update_user_view(request, user_id):
     if 'last_name' in request.data:
         target_user.last_name = request.data['last_name']
     if 'email' in request.data:
+        if UserProfile.objects.filter(email=request.data['email']).exclude(id=target_user.id).exists():
+            return Response({'error': 'Email already in use'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
         target_user.email = request.data['email']
     if 'phone_number' in request.data:
         target_user.phone_number = request.data['phone_number']
@@ -214,7 +235,12 @@ def update_user_view(request, user_id):
     if 'password' in request.data and request.data['password']:
         target_user.set_password(request.data['password'])
     
-    target_user.save()
+    try:
+        with transaction.atomic():
+            target_user.save()
+    except IntegrityError:
+        return Response({'error': 'Email already in use'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
     return Response({
         'user': UserProfileSerializer(target_user).data,
         'message': 'User updated successfully'
@@ -223,20 +249,9 @@ def update_user_view(request, user_id):
 
 @api_view(['DELETE'])
 @permission_classes([AllowAny])
+@role_required('Warden', message='Only Warden can delete users')
 def delete_user_view(request, user_id):
-    current_user_id = request.session.get('user_id')
-    if not current_user_id:
-        return Response({'error': 'Not logged in'}, status=status.HTTP_401_UNAUTHORIZED)
-    
-    try:
-        current_user = UserProfile.objects.get(id=current_user_id)
-        if current_user.role != 'Warden':
-            return Response({'error': 'Only Warden can delete users'}, 
-                          status=status.HTTP_403_FORBIDDEN)
-    except UserProfile.DoesNotExist:
-        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
-    
-    if int(user_id) == int(current_user_id):
+    if int(user_id) == request.user.id:
         return Response({'error': 'Cannot delete your own account'}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
@@ -257,26 +272,20 @@ def request_password_reset_view(request):
     
     try:
         user = UserProfile.objects.get(email=email)
-        
-        try:
-            reset_code = user.generate_reset_code()
-        except Exception as e:
-            return Response({'error': f'Failed to generate code: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        try:
-            send_mail(
-                subject='Password Reset Code - Hostel Inventory',
-                message=f'Your password reset code is: {reset_code}\n\nThis code will expire in 15 minutes.\n\nIf you did not request this reset, please ignore this email.',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                fail_silently=False,
-            )
-            return Response({'message': 'Reset code sent to your email'}, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({'message': 'Reset code generated (check server logs)'}, status=status.HTTP_200_OK)
-            
     except UserProfile.DoesNotExist:
         return Response({'message': 'If email exists, reset code has been sent'}, status=status.HTTP_200_OK)
+    
+    try:
+        reset_code = user.generate_reset_code()
+    except Exception as e:
+        return Response({'error': f'Failed to generate code: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    enqueue(
+        subject='Password Reset Code - Hostel Inventory',
+        body=f'Your password reset code is: {reset_code}\n\nThis code will expire in 15 minutes.\n\nIf you did not request this reset, please ignore this email.',
+        recipient_list=[email],
+    )
+    return Response({'message': 'Reset code sent to your email'}, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
@@ -289,16 +298,17 @@ def verify_reset_code_view(request):
     
     try:
         user = UserProfile.objects.get(email=email)
-        if user.verify_reset_code(code):
-            return Response({'message': 'Code verified successfully'}, status=status.HTTP_200_OK)
-        else:
-            return Response({'error': 'Invalid or expired code'}, status=status.HTTP_400_BAD_REQUEST)
     except UserProfile.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if user.verify_reset_code(code):
+        return Response({'message': 'Code verified successfully'}, status=status.HTTP_200_OK)
+    return Response({'error': 'Invalid or expired code'}, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PasswordIPThrottle, PasswordAccountThrottle])
 def reset_password_with_code_view(request):
     email = request.data.get('email')
     code = request.data.get('code')
@@ -311,11 +321,27 @@ def reset_password_with_code_view(request):
     
     try:
         user = UserProfile.objects.get(email=email)
-        if user.verify_reset_code(code):
-            user.set_password(new_password)
-            user.clear_reset_code()
-            return Response({'message': 'Password reset successfully'}, status=status.HTTP_200_OK)
-        else:
-            return Response({'error': 'Invalid or expired code'}, status=status.HTTP_400_BAD_REQUEST)
     except UserProfile.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not user.verify_reset_code(code):
+        return Response({'error': 'Invalid or expired code'}, status=status.HTTP_400_BAD_REQUEST)
+    user.set_password(new_password)
+    user.clear_reset_code()
+    return Response({'message': 'Password reset successfully'}, status=status.HTTP_200_OK)
+
+
+class UserDirectoryViewSet(FastReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Warden-only user directory, ordered by username and paginated.
+    ``?search=`` matches the start of username, first/last name or email;
+    ``?role=`` filters by role.
+    """
+    queryset = UserProfile.objects.order_by('username')
+    serializer_class = UserProfileSerializer
+    permission_classes = [HasRole]
+    required_roles = ['Warden']
+    pagination_class = KeysetPagination
+    filter_backends = [FieldFilterBackend, filters.SearchFilter]
+    filter_fields = {'role': 'role'}
+    search_fields = ['^username', '^first_name', '^last_name', '^email']
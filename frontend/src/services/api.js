@@ -32,6 +32,11 @@ export const listUsers = () => {
     return axios.get(`${API_BASE_URL}/users/list/`);
 };
 
+// Paginated: { search, role, cursor, page_size } -> { next, results }
+export const getUserDirectory = (params = {}) => {
+    return axios.get(`${API_BASE_URL}/users/directory/`, { params });
+};
+
 export const updateUser = (userId, userData) => {
     return axios.put(`${API_BASE_URL}/users/update-user/${userId}/`, userData);
 };
@@ -40,8 +45,8 @@ export const deleteUser = (userId) => {
     return axios.delete(`${API_BASE_URL}/users/delete-user/${userId}/`);
 };
 
-export const getAssets = () => {
-    return axios.get(`${API_BASE_URL}/assets/assets/`);
+export const getAssets = (filters = {}) => {
+    return axios.get(`${API_BASE_URL}/assets/assets/`, { params: { paginate: 'false', ...filters } });
 };
 
 export const createAsset = (assetData) => {
@@ -56,8 +61,8 @@ export const deleteAsset = (id) => {
     return axios.delete(`${API_BASE_URL}/assets/assets/${id}/`);
 };
 
-export const getRooms = () => {
-    return axios.get(`${API_BASE_URL}/rooms/`);
+export const getRooms = (filters = {}) => {
+    return axios.get(`${API_BASE_URL}/rooms/`, { params: { paginate: 'false', ...filters } });
 };
 
 export const createRoom = (roomData) => {
@@ -76,8 +81,8 @@ export const getDashboardSummary = () => {
     return axios.get(`${API_BASE_URL}/dashboard/summary/`);
 };
 
-export const getDamageReports = () => {
-    return axios.get(`${API_BASE_URL}/assets/damage-reports/`);
+export const getDamageReports = (filters = {}) => {
+    return axios.get(`${API_BASE_URL}/assets/damage-reports/`, { params: { paginate: 'false', ...filters } });
 };
 
 export const createDamageReport = (reportData) => {